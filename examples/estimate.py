@@ -0,0 +1,59 @@
+#                    Estimate Check:
+#
+#   Compares the estimated rows, columns and bytes of different Block chains with the ones of
+#   the actual output. The output of this script shows the relative error of the estimates.
+#   Bytes are counted in UTF-8. tests/test_estimate.py checks the same layouts against a tolerance.
+#
+import random
+from ttf import Block, Lock, Estimate
+
+random.seed(1337)
+defaultPadding = [0, 5, 1, 0]
+words = ["ttf", "block", "terminal", "text", "formatter", "Keyword", "a", "alignment", "lock", "neighbour"]
+
+def randomBody(words_count, lines=1):
+    return "\n".join(" ".join(random.choice(words) for ctr in range(words_count)) for line in range(lines))
+
+def randomBlock(size, words_count, lines=1, newline=False):
+    block = Block(size, defaultPadding, ["Example Block: ", "yellow#bold", newline], [randomBody(words_count, lines), "blue#bold", "auto"])
+    block.addKeyword("Keyword", "magenta")
+    return block
+
+def layoutBasic():
+    block1 = randomBlock(40, 200)
+    block2 = randomBlock(40, 60)
+    block3 = randomBlock(40, 100, newline=True)
+    block4 = randomBlock(40, 80, 3)
+    lock = Lock()
+    block5 = randomBlock(40, 30)
+    block4.addPrintMaster(lock)
+    block5.addPrintMaster(lock)
+    block1.right = block2
+    block2.right = block3
+    block2.bottom = block4
+    block3.bottom = block5
+    return block1
+
+def layoutWide():
+    block1 = randomBlock(80, 2000, 20)
+    block2 = randomBlock(60, 500, 50)
+    block1.right = block2
+    block2.bottom = randomBlock(60, 300, 3)
+    return block1
+
+def layoutCapped():
+    block1 = randomBlock(50, 5000, 100)
+    block1.maxLines = 40
+    block1.right = randomBlock(50, 300)
+    return block1
+
+print("{:<10} {:>22} {:>22} {:>28}".format("layout", "rows (est/real)", "columns (est/real)", "bytes (est/real)"))
+for name, layout in [("basic", layoutBasic), ("wide", layoutWide), ("capped", layoutCapped)]:
+    block = layout()
+    estimate = Estimate.fromBlockChain(block)
+    output = block.getBlockChain()
+    rows = output.count("\n")
+    columns = max(Block.realLength(line) for line in output.splitlines())
+    error = lambda est, real: "{:+.1f}%".format(100 * (est - real) / real)
+    print("{:<10} {:>8}/{:<6}{:>7} {:>8}/{:<6}{:>7} {:>10}/{:<8}{:>8}".format(name, estimate.rows, rows, error(estimate.rows, rows),
+          estimate.columns, columns, error(estimate.columns, columns), estimate.bytes, len(output.encode()), error(estimate.bytes, len(output.encode()))))
@@ -0,0 +1,57 @@
+#                       Grid Layout:                     
+#                                                         
+#          0              1              2              3
+#   __________    __________    __________     __________ 
+#  |          |  |          |  |          |   |          |
+#  |  Block1  |  |  Block2  |  |  Block3  |   |  Block4  |   0
+#  |          |  |__________|  |__________|   |          |
+#  |          |                               |          |
+#  |          |   _________________________   |          |
+#  |          |  |                         |  |          |
+#  |          |  |         Block5          |  |          |   1
+#  |          |  |_________________________|  |          |
+#  |          |                               |          |
+#  |          |   __________    __________    |          |
+#  |          |  |          |  |          |   |          |
+#  |          |  |  Block6  |  |  Block7  |   |          |   2
+#  |__________|  |__________|  |__________|   |__________|
+#                                                        
+from ttf import Block, Grid
+
+blocksize = 40
+defaultPadding = [0, 5, 1, 0]
+
+headline = "Example Block: "
+headlineColor = "yellow#bold"
+headlineNewline = False
+
+body = "oooooooooooooooooooooooooo"
+bodyColor = "blue#bold"
+bodyIndent = "auto"
+
+
+Block1Headline = [headline, headlineColor, headlineNewline]
+Block1Body = [body * 15, bodyColor, bodyIndent]
+Block1 = Block(blocksize, defaultPadding, Block1Headline, Block1Body)
+
+Block2Headline = [headline, headlineColor, headlineNewline]
+Block2Body = [body * 4, bodyColor, bodyIndent]
+Block2 = Block(blocksize, defaultPadding, Block2Headline, Block2Body)
+
+Block3 = Block2.clone()
+Block4 = Block1.clone()
+Block5 = Block1.clone()
+Block6 = Block2.clone()
+Block7 = Block2.clone()
+
+grid = Grid([blocksize] * 4)
+grid.add(Block1, 0, 0, rowSpan=3)
+grid.add(Block2, 0, 1)
+grid.add(Block3, 0, 2)
+grid.add(Block4, 0, 3, rowSpan=3)
+grid.add(Block5, 1, 1, columnSpan=2)
+grid.add(Block6, 2, 1)
+grid.add(Block7, 2, 2)
+
+print()
+grid.printGrid()
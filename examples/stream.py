@@ -0,0 +1,47 @@
+#                     Stream Layout:                     
+#                                                         
+#   __________    __________    __________ 
+#  |          |  |          |  |          |
+#  | Service1 |  | Service2 |  | Service3 |
+#  |__________|  |__________|  |__________|
+#   __________    __________        .
+#  |          |  |          |       .
+#  | Service1 |  | Service2 |       .
+#  |__________|  |__________|
+#        .             .
+#        .             .
+#
+import time
+import random
+import threading
+from ttf import Block, Stream
+
+blocksize = 40
+defaultPadding = [0, 5, 1, 0]
+
+headlineColor = "yellow#bold"
+headlineNewline = False
+
+body = "oooooooooooooooooooooooooo"
+bodyColor = "blue#bold"
+bodyIndent = "auto"
+
+stream = Stream([blocksize] * 3, timeout=0.5)
+
+def produceEvents(column):
+    for event in range(5):
+        time.sleep(random.random())
+        headline = ["Service{} Event{}: ".format(column + 1, event), headlineColor, headlineNewline]
+        stream.append(column, Block(blocksize, defaultPadding, headline, [body * random.randint(1, 3), bodyColor, bodyIndent]))
+
+producers = [threading.Thread(target=produceEvents, args=(column,)) for column in range(3)]
+for producer in producers:
+    producer.start()
+
+printer = threading.Thread(target=stream.printStream)
+printer.start()
+
+for producer in producers:
+    producer.join()
+stream.close()
+printer.join()
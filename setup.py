@@ -11,7 +11,7 @@ setuptools.setup(
     description="ttf - A library to create component based console output",
     long_description=long_description,
     long_description_content_type="text/markdown",
-    install_requires=["termcolor", "pyparsing"],
+    install_requires=["termcolor"],
     packages=setuptools.find_packages(),
     classifiers=[
         "Programming Language :: Python :: 3",
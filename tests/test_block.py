@@ -0,0 +1,218 @@
+import os
+import random
+import shutil
+import signal
+import pytest
+from ttf import Block, Lock
+
+
+def test_resize_is_redrawn_outside_of_handler(capsys):
+    block = Block(0.5, [0, 0, 0, 0], ["Head: ", "none", False], ["word " * 30, "none", 0])
+    previous = block.watchResize()
+    try:
+        first = capsys.readouterr().out
+        assert "word" in first
+        assert not block.redrawResized()
+
+        #the handler itself must not print anything
+        os.kill(os.getpid(), signal.SIGWINCH)
+        assert capsys.readouterr().out == ""
+        assert block.redrawResized(clear=False)
+        assert capsys.readouterr().out == first
+        assert not block.redrawResized()
+    finally:
+        signal.signal(signal.SIGWINCH, previous)
+
+
+def test_capped_lines_match_splitlines():
+    body = "one\vtwo\fthree\x1cfour five\r\nsix\rseven\nlast"
+    uncapped = Block(30, [0, 0, 0, 0], ["", "", False], [body, "none", 0])
+    capped = Block(30, [0, 0, 0, 0], ["", "", False], [body, "none", 0], maxLines=100)
+    assert capped.buildContent(terminalWidth=80) == uncapped.buildContent(terminalWidth=80)
+
+    capped.maxLines = 3
+    content = capped.buildContent(terminalWidth=80)
+    assert [line.strip() for line in content] == ["one", "two", "three", "… 5 more lines (25 chars)"]
+
+
+def buildCore(block, maxLines=None):
+    content = block.buildContent(maxLines, terminalWidth=80)
+    return content[block.padding[0]:len(content) - block.padding[2]]
+
+
+def test_capped_lines_are_prefix_of_uncapped():
+    block = Block(7, [0, 0, 0, 0], ["H: ", "none", True], ["xxxxx x xxx xxxxxxxxxxxxx x xxxxxxxx x xxx xxxxxxxxxxxxx "
+                                                            "xxxxxxxx xxxxxxxx xxxxx", "none", 0])
+    uncapped = buildCore(block)
+    capped = buildCore(block, 5)
+    assert capped[:-1] == uncapped[:5]
+    assert capped[-1].startswith("…")
+
+    random.seed(1337)
+    for count in range(500):
+        words = [" ".join("x" * random.choice([1, 3, 5, 8, 13, 40]) for _ in range(random.randint(1, 30)))
+                 for _ in range(random.randint(1, 4))]
+        block = Block(random.randint(16, 24), random.choice([[0, 0, 0, 0], [1, 1, 1, 1]]),
+                      [random.choice(["H: ", "Head line: "]), "none", random.random() < 0.5],
+                      ["\n".join(words), "none", random.choice([0, 2, "auto"])])
+        maxLines = random.randint(1, 8)
+        uncapped = buildCore(block)
+        capped = buildCore(block, maxLines)
+        if len(uncapped) <= maxLines:
+            assert capped == uncapped
+        else:
+            assert capped[-1].strip().startswith("…")
+            assert capped[:-1] == uncapped[:maxLines]
+
+
+def test_overflow_counts_omitted_content():
+    block = Block(20, [0, 0, 0, 0], ["", "none", False], ["x" * 5000, "none", 0], maxLines=3)
+    content = block.buildContent(terminalWidth=80)
+    assert len(content) == 4
+    #the overflow line is cut to the width of the block
+    assert content[-1] == "… 1 more lines (4,93"
+    assert all(len(line) == 20 for line in content)
+
+    block.bodyContent = "\n".join(["line"] * 1000)
+    content = block.buildContent(terminalWidth=80)
+    assert [line.strip() for line in content[:3]] == ["line"] * 3
+    assert content[-1].startswith("… 997 more lines")
+
+
+def test_capped_blocks_keep_locks_aligned():
+    lock = Lock()
+    createBlock = lambda words, **kwargs: Block(20, [0, 0, 0, 0], ["", "none", False], [" ".join(words), "none", 0], **kwargs)
+
+    left = createBlock(["left"] * 40)
+    top1 = createBlock(["top1"] * 20)
+    top2 = createBlock(["top2"] * 4)
+    bottom1 = createBlock(["bottom1"], printMaster=lock)
+    bottom2 = createBlock(["bottom2"], printMaster=lock)
+    left.right = top1
+    top1.right = top2
+    top1.bottom = bottom1
+    top2.bottom = bottom2
+
+    lines = left.getBlockChain(maxLines=3).splitlines()
+    assert all(len(line) == 60 for line in lines)
+    rows = {word: [index for index, line in enumerate(lines) if word in line] for word in ["bottom1", "bottom2"]}
+    #both bottom blocks wait for the capped top block of the lock
+    assert rows["bottom1"] == rows["bottom2"] == [4]
+    assert lines[3].count("…") == 2
+
+
+def createLargeChain():
+    blocks = []
+    for index in range(4):
+        body = " ".join("word{} aaab error".format(number) for number in range(index * 50, index * 50 + 300))
+        block = Block(30, [0, 1, 0, 1], ["Block{}: ".format(index), "yellow", False], [body, "blue", "auto"])
+        block.addKeyword("error", "red", literal=True)
+        block.addKeyword(r"word\d+", "green")
+        if index % 2:
+            with pytest.warns(RuntimeWarning):
+                block.addKeyword("(a+)+b", "magenta")
+        if blocks:
+            blocks[-1].right = block
+        blocks.append(block)
+    return blocks[0]
+
+
+@pytest.mark.parametrize("threads", [False, True])
+def test_parallel_build_equals_sequential(threads, monkeypatch):
+    monkeypatch.setattr(Block, "parallelThreshold", 1024)
+    expected = [block.buildContent(3, None, 120) for block in createLargeChain().collectBlocks()]
+    expected += [block.buildContent(None, None, 120) for block in createLargeChain().collectBlocks()]
+
+    for maxLines in [3, None]:
+        chain = createLargeChain()
+        chain.buildParallel(maxLines, None, 120, workers=2, threads=threads)
+        chain.buildBlockChain(maxLines, None, 120)
+        for block in chain.collectBlocks():
+            assert block.content == expected.pop(0)
+            assert not any(keyword.disabled for keyword in block.keywords)
+
+
+@pytest.mark.parametrize("terminalWidth", range(0, 12))
+def test_narrow_widths(terminalWidth):
+    for padding in [[0, 0, 0, 0], [1, 2, 1, 3]]:
+        for headNewline in [False, True]:
+            block = Block(0.5, padding, ["Head: ", "none", headNewline], ["hello world\nfoo bar", "none", "auto"], maxSize=8)
+            content = block.buildContent(terminalWidth=terminalWidth)
+            assert block.width >= padding[1] + padding[3] + 1
+            assert all(len(line) == block.width for line in content)
+            assert "".join(content).replace(" ", "") == "Head:helloworldfoobar"
+
+
+def createPrintLockChain():
+    lock = Lock()
+    createBlock = lambda words, **kwargs: Block(20, [0, 1, 1, 0], ["Head: ", "none", False], [" ".join(words), "none", "auto"], **kwargs)
+    block1 = createBlock(["one"] * 40)
+    block2 = createBlock(["two"] * 10)
+    block3 = createBlock(["three"] * 16)
+    block4 = createBlock(["four"] * 10, printMaster=lock)
+    block5 = createBlock(["five"] * 10, printMaster=lock)
+    block1.right = block2
+    block2.right = block3
+    block2.bottom = block4
+    block3.bottom = block5
+    return block1
+
+
+def createVanishLockChain():
+    lock = Lock()
+    createBlock = lambda words, size=20, **kwargs: Block(size, [0, 1, 1, 0], ["Head: ", "none", False], [" ".join(words), "none", "auto"], **kwargs)
+    block1 = createBlock(["one"] * 60)
+    block2 = createBlock(["two"] * 12)
+    block3 = createBlock(["three"] * 8, vanishMaster=lock)
+    block4 = createBlock(["four"] * 60)
+    block5 = createBlock(["five"] * 20, size=40, printMaster=lock)
+    block6 = createBlock(["six"] * 12)
+    block7 = createBlock(["seven"] * 12)
+    block1.right = block2
+    block2.right = block3
+    block3.right = block4
+    block2.bottom = block5
+    block5.bottom = block6
+    block6.right = block7
+    return block1
+
+
+@pytest.mark.parametrize("createChain", [createPrintLockChain, createVanishLockChain])
+@pytest.mark.parametrize("maxLines", [None, 3])
+def test_on_demand_equals_eager(createChain, maxLines, monkeypatch):
+    monkeypatch.setattr(shutil, "get_terminal_size", lambda *args: os.terminal_size((80, 24)))
+    eager = createChain()
+    eager.buildBlockChain(maxLines, None, 80)
+    expected = eager.getBlockChain()
+
+    assert createChain().getBlockChain(maxLines, onDemand=True) == expected
+    assert createChain().getBlockChain(maxLines, minimalSGR=True, onDemand=True) == createChain().getBlockChain(maxLines, minimalSGR=True)
+
+
+def test_on_demand_builds_bottom_blocks_late(monkeypatch):
+    left = Block(20, [0, 0, 0, 0], ["", "none", False], [" ".join(["left"] * 40), "none", 0])
+    top = Block(20, [0, 0, 0, 0], ["", "none", False], [" ".join(["top"] * 10), "none", 0])
+    top.bottom = Block(20, [0, 0, 0, 0], ["", "none", False], ["bottom", "none", 0])
+    left.right = top
+
+    rows = []
+    builds = []
+    buildContent = Block.buildContent
+    printLine = Block.printLine
+
+    def countingBuildContent(block, *args, **kwargs):
+        builds.append((block.bodyContent.split()[0], len(rows)))
+        return buildContent(block, *args, **kwargs)
+
+    def countingPrintLine(block, *args, **kwargs):
+        rows.append(block)
+        return printLine(block, *args, **kwargs)
+
+    monkeypatch.setattr(Block, "buildContent", countingBuildContent)
+    monkeypatch.setattr(Block, "printLine", countingPrintLine)
+    lines = left.getBlockChain(onDemand=True).splitlines()
+
+    firstRow = next(index for index, line in enumerate(lines) if "bottom" in line)
+    assert firstRow == 2
+    #the bottom block is build exactly once, after the last row of the top block was printed
+    assert builds == [("left", 1), ("top", 1), ("bottom", firstRow)]
@@ -0,0 +1,72 @@
+import random
+import pytest
+from ttf import Block, Lock, Estimate
+
+#maximum relative error of the estimated rows, columns and bytes
+tolerance = 0.10
+defaultPadding = [0, 5, 1, 0]
+words = ["ttf", "block", "terminal", "text", "formatter", "Keyword", "a", "alignment", "lock", "neighbour", "größe", "…"]
+
+
+def randomBody(wordsCount, lines=1):
+    return "\n".join(" ".join(random.choice(words) for ctr in range(wordsCount)) for line in range(lines))
+
+
+def randomBlock(size, wordsCount, lines=1, newline=False):
+    block = Block(size, defaultPadding, ["Example Block: ", "yellow#bold", newline], [randomBody(wordsCount, lines), "blue#bold", "auto"])
+    block.addKeyword("Keyword", "magenta")
+    return block
+
+
+def layoutBasic():
+    block1 = randomBlock(40, 200)
+    block2 = randomBlock(40, 60)
+    block3 = randomBlock(40, 100, newline=True)
+    block4 = randomBlock(40, 80, 3)
+    lock = Lock()
+    block5 = randomBlock(40, 30)
+    block4.addPrintMaster(lock)
+    block5.addPrintMaster(lock)
+    block1.right = block2
+    block2.right = block3
+    block2.bottom = block4
+    block3.bottom = block5
+    return block1
+
+
+def layoutWide():
+    block1 = randomBlock(80, 2000, 20)
+    block2 = randomBlock(60, 500, 50)
+    block1.right = block2
+    block2.bottom = randomBlock(60, 300, 3)
+    return block1
+
+
+def layoutCapped():
+    block1 = randomBlock(50, 5000, 100)
+    block1.maxLines = 40
+    block1.right = randomBlock(50, 300)
+    return block1
+
+
+@pytest.mark.parametrize("layout", [layoutBasic, layoutWide, layoutCapped])
+@pytest.mark.parametrize("seed", [1337, 42])
+def test_estimate_error(layout, seed):
+    random.seed(seed)
+    block = layout()
+    estimate = Estimate.fromBlockChain(block, terminalWidth=200)
+    output = block.getBlockChain()
+
+    rows = output.count("\n")
+    columns = max(Block.realLength(line) for line in output.splitlines())
+    size = len(output.encode())
+    assert abs(estimate.rows - rows) <= tolerance * rows
+    assert abs(estimate.columns - columns) <= tolerance * columns
+    assert abs(estimate.bytes - size) <= tolerance * size
+
+
+def test_estimate_counts_encoded_bytes():
+    block = Block(30, [0, 0, 0, 0], ["", "", False], ["ä" * 300, "none", 0], maxLines=3)
+    estimate = Estimate.fromBlockChain(block, terminalWidth=80)
+    output = block.getBlockChain()
+    assert abs(estimate.bytes - len(output.encode())) <= tolerance * len(output.encode())
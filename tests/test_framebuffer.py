@@ -0,0 +1,83 @@
+from ttf import Block, Lock, Framebuffer, SGREncoder
+
+
+def visibleCells(string):
+    """Returns each character of a string together with the visible part of the SGR state that applies to it.
+    """
+    cells = []
+    state = SGREncoder.defaultState
+    for part in SGREncoder.escapePattern.split(string):
+        if part.startswith('\x1b'):
+            match = SGREncoder.sgrPattern.fullmatch(part)
+            if match:
+                state = SGREncoder.applyCodes(state, match.group(1))
+            continue
+        for char in part:
+            cells.append((char, SGREncoder.whitespaceState(state) if char.isspace() else state))
+    return cells
+
+
+def createChain():
+    lock = Lock()
+    createBlock = lambda words, color, **kwargs: Block(20, [0, 1, 1, 0], ["Head: ", "yellow#bold", False],
+                                                       [" ".join(words), color, "auto"], **kwargs)
+    block1 = createBlock(["one"] * 40, "blue")
+    block2 = createBlock(["two"] * 10, "red#underline")
+    block3 = createBlock(["three"] * 16, "green")
+    block4 = createBlock(["four"] * 10, "magenta#reverse", printMaster=lock)
+    block5 = createBlock(["five"] * 10, "cyan", printMaster=lock)
+    block1.addKeyword("one", "red")
+    block1.right = block2
+    block2.right = block3
+    block2.bottom = block4
+    block3.bottom = block5
+    return block1
+
+
+def test_from_block_chain_matches_printed_chain():
+    chain = createChain()
+    chain.buildBlockChain(terminalWidth=80)
+    printed = chain.getBlockChain().splitlines()
+
+    framebuffer = Framebuffer.fromBlockChain(createChain(), terminalWidth=80)
+    rendered = framebuffer.render().splitlines()
+    assert framebuffer.height == len(printed)
+    for printedLine, renderedLine in zip(printed, rendered):
+        assert visibleCells(renderedLine) == visibleCells(printedLine)
+
+
+def test_transparent_blit():
+    framebuffer = Framebuffer(6, 2)
+    framebuffer.blitLines(["abcdef", "\x1b[31mghijkl\x1b[0m"], 0, 0)
+    framebuffer.blitLines(["x  y", "\x1b[32m z\x1b[0m  "], 0, 1, transparent=True)
+    framebuffer.blitLines([" ", " "], 0, 5, transparent=True)
+
+    assert ["".join(chars) for chars in framebuffer.chars] == ["axcdyf", "g zjkl"]
+    red, green = framebuffer.styleIds[("31", None, frozenset())], framebuffer.styleIds[("32", None, frozenset())]
+    assert list(framebuffer.cellStyles[0]) == [0] * 6
+    #colored blanks are drawn, default blanks keep the cells below
+    assert list(framebuffer.cellStyles[1]) == [red, green, green, red, red, red]
+
+
+def test_fill_and_partial_reencoding():
+    framebuffer = Framebuffer(8, 3)
+    framebuffer.blitLines(["\x1b[34mbluebox\x1b[0m"] * 3, 0, 0)
+    first = framebuffer.render()
+    encoded = list(framebuffer.encoded)
+
+    framebuffer.fill(1, 2, 3, 1)
+    assert "".join(framebuffer.chars[1]) == "bl   ox "
+    assert framebuffer.encoded[0] is encoded[0]
+    assert framebuffer.encoded[1] is None
+    assert framebuffer.encoded[2] is encoded[2]
+
+    rows = []
+    encodeRow = framebuffer.encodeRow
+    framebuffer.encodeRow = lambda row: rows.append(row) or encodeRow(row)
+    second = framebuffer.render()
+    assert second.splitlines()[0] == first.splitlines()[0]
+    assert second.splitlines()[1] != first.splitlines()[1]
+    assert visibleCells(second.splitlines()[1]) == visibleCells("\x1b[34mbl\x1b[0m   \x1b[34mox\x1b[0m ")
+    #only the changed row was encoded again
+    assert [framebuffer.encoded[row] is encoded[row] for row in range(3)] == [True, False, True]
+    assert rows == [0, 1, 2]
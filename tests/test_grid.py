@@ -0,0 +1,111 @@
+import random
+import signal
+import pytest
+from ttf import Block, Grid
+
+
+def createBlock(words):
+    return Block(10, [0, 1, 0, 0], ["", "", False], [" ".join(words), "none", 0])
+
+
+def renderWithin(grid, seconds=5):
+    """Renders a grid and fails instead of hanging if the printing does not terminate.
+    """
+    def timeout(signum, frame):
+        raise TimeoutError("grid printing did not terminate")
+
+    previous = signal.signal(signal.SIGALRM, timeout)
+    signal.alarm(seconds)
+    try:
+        return grid.getGrid(terminalWidth=80)
+    finally:
+        signal.alarm(0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def gridWords(grid):
+    return sorted(word for cell in grid.cells.values() for word in cell[0].bodyContent.split())
+
+
+def test_span_below_filler():
+    grid = Grid([10, 10])
+    grid.add(createBlock(["A{}".format(i) for i in range(6)]), 0, 0, rowSpan=2)
+    grid.add(createBlock(["B"]), 0, 1)
+    grid.add(createBlock(["C", "wide"]), 2, 0, columnSpan=2)
+
+    lines = renderWithin(grid).splitlines()
+    assert lines[0].split() == ["A0", "A1", "A2", "B"]
+    assert lines[1].split() == ["A3", "A4", "A5"]
+    assert lines[2].split() == ["C", "wide"]
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_random_spans(seed):
+    random.seed(seed)
+    columns = random.randint(1, 4)
+    rows = random.randint(2, 4)
+    grid = Grid([10] * columns)
+
+    for row in range(rows):
+        for column in range(columns):
+            if (row, column) in grid.positions or random.random() < 0.3:
+                continue
+            rowSpan = random.randint(1, rows - row)
+            columnSpan = random.randint(1, columns - column)
+            words = ["w{}".format(index) for index in range(random.randint(1, 12))]
+            try:
+                grid.add(createBlock(words), row, column, rowSpan, columnSpan)
+            except ValueError:
+                pass
+
+    if not grid.cells:
+        return
+    try:
+        output = renderWithin(grid)
+    except ValueError:
+        #blocks that partially cover a block above are rejected by buildGrid
+        return
+    assert sorted(output.split()) == gridWords(grid)
+
+
+@pytest.mark.parametrize("rows, columns", [(1000, 1), (1, 1000), (40, 25)])
+def test_large_grid(rows, columns, capsys):
+    grid = Grid([10] * columns)
+    for row in range(rows):
+        for column in range(columns):
+            grid.add(createBlock(["r{}c{}".format(row, column)]), row, column)
+
+    grid.printGrid(terminalWidth=80)
+    printed = capsys.readouterr().out
+
+    lines = renderWithin(grid, 60).splitlines()
+    assert printed.splitlines() == lines
+    assert len(lines) == rows
+    assert lines[-1].split()[-1] == "r{}c{}".format(rows - 1, columns - 1)
+    assert sorted(" ".join(lines).split()) == gridWords(grid)
+
+
+def test_mixed_column_sizes():
+    grid = Grid([20, 0.25, 0.25])
+    grid.add(createBlock(["a"]), 0, 0)
+    grid.add(createBlock(["b"]), 0, 1, columnSpan=2)
+    grid.add(createBlock(["c"]), 1, 0)
+    grid.add(createBlock(["d"]), 1, 1, columnSpan=2)
+    grid.add(createBlock(["e"]), 2, 0)
+    grid.add(createBlock(["f"]), 2, 2)
+
+    lines = grid.getGrid(terminalWidth=90).splitlines()
+    assert all(len(line) == 20 + 22 + 22 for line in lines)
+    assert [line.split() for line in lines] == [["a", "b"], ["c", "d"], ["e", "f"]]
+    assert [line.index(word) for line, word in zip(lines, "bdf")] == [20, 20, 42]
+
+
+def test_fillers_are_replaced():
+    grid = Grid([10, 10])
+    grid.add(createBlock(["a"]), 2, 1)
+    grid.fillEmpty()
+    assert len(grid.cells) == 6
+    grid.add(createBlock(["b"]), 0, 0, rowSpan=2, columnSpan=2)
+    assert len(grid.cells) == 3
+    assert sorted(id(cell) for cell in grid.positions.values()) == sorted(id(cell) for cell in grid.cells.values()
+                                                                          for count in range(cell[3] * cell[4]))
@@ -0,0 +1,95 @@
+import time
+import signal
+import threading
+import warnings
+import pytest
+from ttf import Block, Keyword
+
+
+def createBlock(body, size=200):
+    return Block(size, [0, 0, 0, 0], ["", "", False], [body, "none", 0])
+
+
+@pytest.mark.parametrize("pattern, risky", [("(a+)+", True), (r"(\w+\s?)*x", True), ("((ab)*)*", True), ("(a|aa)+$", True),
+                                            (r"(\d+\.)+\d+", False), ("a+b+", False), ("(error|warn)+", False), ("Ke..ord", False)])
+def test_risky_patterns(pattern, risky):
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        keyword = Keyword(pattern)
+    assert keyword.risky == risky
+    assert bool(caught) == risky
+
+
+def test_invalid_pattern():
+    with pytest.raises(ValueError):
+        createBlock("text").addKeyword("(", "red")
+
+
+def test_literal_keyword():
+    block = createBlock("a+b (x) and a+b")
+    block.addKeyword("a+b (x)", "red", literal=True)
+    highlighted = block.highlightKeywords("a+b (x) and a+b")
+    assert highlighted.startswith("\x1b[00m")
+    assert highlighted.count("a+b (x)") == 1
+    assert highlighted.endswith(" and a+b")
+
+
+@pytest.mark.parametrize("pattern", ["(a+)+$", "(a|aa)+$"])
+def test_budget_in_main_thread(pattern, monkeypatch):
+    monkeypatch.setattr(Keyword, "budget", 0.2)
+    block = createBlock("a" * 40 + "!")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        block.addKeyword(pattern, "red")
+        start = time.monotonic()
+        block.buildContent(terminalWidth=80)
+    assert time.monotonic() - start < 5
+    assert list(block.keywords)[0].disabled
+
+
+@pytest.mark.parametrize("pattern", ["(a+)+$", "(a|aa)+$"])
+def test_budget_in_other_thread(pattern):
+    block = createBlock("a" * 40 + "!")
+    with warnings.catch_warnings(record=True) as caught:
+        warnings.simplefilter("always")
+        block.addKeyword(pattern, "red")
+        results = []
+        for count in range(2):
+            thread = threading.Thread(target=lambda: results.append(block.buildContent(terminalWidth=80)))
+            thread.start()
+            thread.join(5)
+            assert not thread.is_alive()
+    #the keyword is skipped inside the thread, reported once and stays enabled for the main thread
+    assert len([warning for warning in caught if "was skipped" in str(warning.message)]) == 1
+    assert results[0] == results[1] == createBlock("a" * 40 + "!").buildContent(terminalWidth=80)
+    assert not list(block.keywords)[0].disabled
+
+
+def test_skipped_keyword_is_highlighted_later():
+    block = createBlock("aaa!")
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        block.addKeyword("(a+)+!", "red")
+
+        previous = signal.signal(signal.SIGALRM, lambda signum, frame: None)
+        try:
+            plain = block.buildContent(terminalWidth=80)
+        finally:
+            signal.signal(signal.SIGALRM, previous)
+        highlighted = block.buildContent(terminalWidth=80)
+
+    assert plain == createBlock("aaa!").buildContent(terminalWidth=80)
+    assert highlighted != plain
+    assert "aaa!" in highlighted[0]
+    assert not list(block.keywords)[0].disabled
+
+
+def test_adding_keyword_again_replaces_color():
+    block = createBlock("an error")
+    block.addKeyword("error", "red")
+    block.addKeyword("error", "blue")
+    assert len(block.keywords) == 1
+
+    expected = createBlock("an error")
+    expected.addKeyword("error", "blue")
+    assert block.highlightKeywords("an error") == expected.highlightKeywords("an error")
@@ -0,0 +1,33 @@
+import io
+import contextlib
+import pytest
+from ttf import Layout
+
+
+def createLayout(head, keywords=[]):
+    return Layout({"blocks": {"a": {"size": 30, "head": head, "body": ["{y[0]}", "none", 0], "keywords": keywords}}})
+
+
+def test_record_does_not_fit_template():
+    layout = createLayout(["{x[k]} ", "none", False])
+    assert "ok" in layout.render({"x": {"k": "ok"}, "y": ["v"]}, 80)
+
+    for record in [{"x": {}}, {"x": {"k": 1}, "y": 5}, {"x": 1, "y": ["v"]}]:
+        with pytest.raises(ValueError):
+            layout.render(record, 80)
+
+
+def test_invalid_block_properties():
+    with pytest.raises(ValueError):
+        createLayout(["head", "none"])
+    with pytest.raises(ValueError):
+        createLayout(["head", "none", False], [["keyword"]])
+
+
+def test_render_keeps_redirected_stdout():
+    layout = createLayout(["head ", "none", False])
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        layout.render({"y": ["v"]}, 80)
+        print("after render")
+    assert output.getvalue() == "after render\n"
@@ -0,0 +1,37 @@
+from ttf import SGREncoder
+from ttf.Block import coloredWrapper
+
+
+def visibleCells(string):
+    """Returns each character of a string together with the SGR state that applies to it.
+    """
+    cells = []
+    state = SGREncoder.defaultState
+    for part in SGREncoder.escapePattern.split(string):
+        if part.startswith('\x1b'):
+            match = SGREncoder.sgrPattern.fullmatch(part)
+            if match:
+                state = SGREncoder.applyCodes(state, match.group(1))
+            continue
+        for char in part:
+            foreground, background, attributes = state
+            if char.isspace():
+                #blanks show the background and the foreground only through underline, reverse and strike through
+                attributes = attributes & {4, 7, 9}
+                foreground = foreground if attributes else None
+            cells.append((char, foreground, background, attributes))
+    return cells
+
+
+def test_whitespace_with_visible_foreground():
+    for attribute in ["reverse", "underline"]:
+        row = coloredWrapper("  ", "red#" + attribute) + coloredWrapper("  ", "green#" + attribute) + "x"
+        encoded = SGREncoder.encode(row)
+        assert visibleCells(encoded) == visibleCells(row)
+
+
+def test_whitespace_without_attributes():
+    row = coloredWrapper("a", "red") + coloredWrapper("   ", "green") + coloredWrapper("b", "red")
+    encoded = SGREncoder.encode(row)
+    assert visibleCells(encoded) == visibleCells(row)
+    assert len(encoded) < len(row)
@@ -0,0 +1,42 @@
+import threading
+import pytest
+from unittest import mock
+from ttf import Block, Stream
+
+
+def test_relative_sizes_survive_resize(capsys):
+    stream = Stream([0.5, 0.5], timeout=0.1, terminalWidth=80)
+    printer = threading.Thread(target=stream.printStream)
+    printer.start()
+
+    stream.append(0, Block(0, [0, 0, 0, 0], ["", "", False], ["left " * 20, "none", 0]))
+    #a resize after the creation of the Stream must not change the width of the columns
+    with mock.patch("shutil.get_terminal_size", return_value=mock.Mock(columns=120)):
+        stream.append(1, Block(0, [0, 0, 0, 0], ["", "", False], ["right " * 20, "none", 0]))
+    stream.close()
+    printer.join()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines
+    assert all(len(line) == 80 for line in lines)
+
+
+def test_blocks_take_the_width_of_their_column(capsys):
+    stream = Stream([20, 0.25], timeout=0.1, terminalWidth=80)
+    stream.append(0, Block(5, [0, 0, 0, 0], ["", "", False], ["left " * 20, "none", 0], minSize=40))
+    stream.append(1, Block(0.9, [0, 0, 0, 0], ["", "", False], ["right " * 20, "none", 0], maxSize=10))
+    stream.close()
+    stream.printStream()
+
+    lines = capsys.readouterr().out.splitlines()
+    assert lines
+    assert all(len(line) == 40 for line in lines)
+    assert lines[0].split() == ["left"] * 4 + ["right"] * 3
+
+
+def test_append_to_closed_stream():
+    stream = Stream([20], timeout=0.1, terminalWidth=80)
+    stream.close()
+    with pytest.raises(ValueError):
+        stream.append(0, Block(20, [0, 0, 0, 0], ["", "", False], ["text", "none", 0]))
+    assert not any(stream.columns)
@@ -1,11 +1,17 @@
 import re
 import sys
+import copy
+import shutil
+import signal
 import textwrap
 import itertools
-from pyparsing import *
+import concurrent.futures
 from io import StringIO
 from termcolor import colored
+from collections import OrderedDict
 from .Lock import Lock
+from .Keyword import Keyword
+from .SGREncoder import SGREncoder
 
 def coloredWrapper(string, color):
     """The termcolor.colored function has the downside that color codes and attributes have to
@@ -39,6 +45,21 @@ def coloredWrapper(string, color):
 
 
 
+def buildDetached(block, buildArguments):
+    """Helper function for Block.buildParallel. It is defined on module level, since it needs to be pickled
+       when it is executed inside a process pool.
+
+    Parameters:
+        block                   (Block)                     Detached Block that should be build
+        buildArguments          (tuple)                     Arguments for buildContent (maxLines, overflow, terminalWidth)
+
+    Returns:
+        array(str)              The content of the Block
+    """
+    return block.buildContent(*buildArguments)
+
+
+
 class Block: 
     """Blocks are structured output components. It has a fixed size, padding, headline and body and can contain
        neighbourship relation ships. If a Block is printed, it will wrap the text inside to the approtiate size
@@ -66,13 +87,25 @@ class Block:
     Returns:
         None
     """
-
-
-    def __init__(self, size=90, padding=[0,0,0,0], head=["", "", ""], body=["", "", 0], right=None, bottom=None, unlocked=False, printMaster=None, vanishMaster=None):
+    #format string of the line that is shown below capped blocks. It receives the number of omitted lines
+    #and the number of omitted characters, which also covers a single line that was cut
+    defaultOverflow = "\u2026 {0:,} more lines ({1:,} chars)"
+    #number of different builds (e.g. for different terminal widths) each block keeps in its content cache
+    cacheSize = 4
+    #blocks with at least this number of characters in head and body are build in parallel by buildParallel
+    parallelThreshold = 32 * 1024
+    #line breaks that are recognized by str.splitlines
+    lineBreakPattern = re.compile('\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]')
+    #ANSI escape sequences that are ignored when computing the length of a string
+    escapePattern = re.compile('\x1b\\[(?:[0-9]+(?:;[0-9]+)*)?[A-Za-z]')
+
+
+    def __init__(self, size=90, padding=[0,0,0,0], head=["", "", ""], body=["", "", 0], right=None, bottom=None, unlocked=False, printMaster=None, vanishMaster=None, maxLines=None, overflow=None, minSize=None, maxSize=None):
         """Creates a new Block object. 
 
         Parameters:
-            size             (int)                       The horizontal size that the block takes on the screen
+            size             (int|float)                 The horizontal size that the block takes on the screen. Floats are
+                                                         interpreted as fraction of the terminal width
             padding          (array[int,int,int,int])    The padding for text contained in block [upper, right, lower, left]
             head             (array[str,str,bool])       An optional heading for the block [content, color, separator]
             body             (array[str,str,int])        The body of the block [content, color, indent]
@@ -80,11 +113,21 @@ class Block:
             bottom           (Block)                     The bottom neigbor of this block
             unlocked         (Boolean)                   Determines if the corresponding Block is unlocked
             printMaster      (Lock)                      Assigns the current Block a printMaster to keep it aligned in a row
+            vanishMaster     (Lock)                      Assigns the current Block a vanishMaster that controls when it vanishes
+            maxLines         (int)                       Maximum number of content lines. Overrides the chain-wide default
+            overflow         (string)                    Format string for the line that summarizes omitted lines
+            minSize          (int)                       Lower bound for the resolved size of the block
+            maxSize          (int)                       Upper bound for the resolved size of the block
 
         Returns:
             Block:  An object that can be placed beside other blocks that are formatted nicly when printed
         """
+        #size may be relative to the terminal width. The resolved size is stored in self.width
+        #and is updated each time the block is build
         self.size = size
+        self.minSize = minSize
+        self.maxSize = maxSize
+        self.width = None
         self.padding = padding
 
         #we could put the optional newline at the end of the block into head[0]
@@ -99,6 +142,11 @@ class Block:
 
         self.keywords = {}
 
+        #maxLines and overflow may be None, which means that the chain-wide default
+        #passed to buildBlockChain is used instead
+        self.maxLines = maxLines
+        self.overflow = overflow
+
         self.right = right
         self.bottom = bottom
         
@@ -110,6 +158,9 @@ class Block:
 
         self.content = None
         self.generator = None
+        self.contentCache = OrderedDict()
+        #set by the SIGWINCH handler of watchResize
+        self.resizePending = False
 
 
     def __str__(self):
@@ -126,23 +177,19 @@ class Block:
 
 
 
-    def addKeyword(self, keyword, color):
+    def addKeyword(self, keyword, color, literal=False):
         """This function can be used to add keywords after creation of a Block object. Keywords are seperatly highlighted
-           inside Blocks.
+           inside Blocks. Invalid regular expressions raise a ValueError.
 
         Parameters:
             keyword                     (string)            Keyword to highlight. Should be a valid regular expression
             color                       (string)            Color which is used to highlight the keyword
+            literal                     (bool)              Highlight the keyword literally instead of as regular expression
 
         Returns:
             None
         """
-        try:
-            keyword = "({})".format(keyword)
-            regex = re.compile(keyword)
-            self.keywords[regex] = color
-        except:
-            pass
+        self.keywords[Keyword(keyword, literal)] = color
 
 
     def highlightKeywords(self, string):
@@ -154,6 +201,20 @@ class Block:
         Returns:
             None
         """
+        return self.highlightLines([string])[0]
+
+
+    def highlightLines(self, lines):
+        """Applies the colorization of self.keywords to a list of lines. Keywords that exceed their time budget
+           are disabled and risky keywords that cannot be interrupted are skipped. Both leave the lines unchanged
+           (see Keyword).
+
+        Parameters:
+            lines                       (array[str])        Lines in which the keywords should be highlighted
+
+        Returns:
+            lines                       (array[str])        Lines with highlighted keywords
+        """
         for keyword, color in self.keywords.items():
             #here we apply a dirty hack. Since the algorithm that colors the whole block will search for the signature
             #\x1b[0m and append the ANSI block color code behind it. This needs to be done, since nested colors would
@@ -163,8 +224,8 @@ class Block:
             #reset every ANSI change in front of a nested color, but this would get replaced by the body highlighter. 
             #To avoid this, we use the signature '\x1b[00m', which has the same effect as '\x1b[0m', but is not replaced
             #by the body highlighter.
-            string = keyword.sub('\x1b[00m{}'.format(coloredWrapper(r'\1', color)), string)
-        return string
+            lines = keyword.highlightLines(lines, '\x1b[00m{}'.format(coloredWrapper('{}', color)))
+        return lines
             
 
     def clone(self, withNeighbors=False, withLocks=False):
@@ -180,7 +241,8 @@ class Block:
         copiedPadding = self.padding
         copiedHeadline = [self.headContent, self.headColor, self.headNewline]
         copiedBody = [self.bodyContent, self.bodyColor, self.bodyIndent]
-        copiedBlock = Block(self.size, copiedPadding, copiedHeadline, copiedBody)
+        copiedBlock = Block(self.size, copiedPadding, copiedHeadline, copiedBody, maxLines=self.maxLines, overflow=self.overflow,
+                            minSize=self.minSize, maxSize=self.maxSize)
         if withNeighbors:
             copiedBlock.right = self.right
             copiedBlock.bottom = self.bottom
@@ -220,6 +282,80 @@ class Block:
             self.vanishLock = Lock(False, vanishMaster)
 
 
+    def copyBlockChain(self, memo=None):
+        """Printing a block chain modifies the blocks inside of it. This function creates a copy of the whole chain,
+           including neighbours and locks, that can be printed while the original chain stays untouched. Contents
+           and caches are shared between the original and the copy.
+
+        Parameters:
+            memo                (dict)                  Already copied blocks and locks, indexed by their id
+
+        Returns:
+            copiedBlock         (Block)                 Copy of self that is connected to copies of all neighbours
+        """
+        if memo is None:
+            memo = {}
+        if id(self) in memo:
+            return memo[id(self)]
+
+        #the blocks are copied first and connected afterwards, since chains may be too long to copy them recursively
+        blocks = [block for block in self.collectBlocks() if id(block) not in memo]
+        for block in blocks:
+            memo[id(block)] = copy.copy(block)
+
+        for block in blocks:
+            copiedBlock = memo[id(block)]
+            copiedBlock.lock = block.lock.copyLock(memo)
+            if block.vanishLock:
+                copiedBlock.vanishLock = block.vanishLock.copyLock(memo)
+            if block.right:
+                copiedBlock.right = memo[id(block.right)]
+            if block.bottom:
+                copiedBlock.bottom = memo[id(block.bottom)]
+            if block.content:
+                copiedBlock.generator = copiedBlock.buildGenerator()
+        return memo[id(self)]
+
+
+    def resolveSize(self, terminalWidth=None):
+        """Resolves the size specification of the block to a fixed number of columns. Relative sizes are
+           computed from the terminal width and the result is clamped to minSize and maxSize. Blocks are never
+           narrower than their left and right padding plus one column.
+
+        Parameters:
+            terminalWidth       (int)                   Width to resolve against. Defaults to the current terminal width
+
+        Returns:
+            width               (int)                   Number of columns the block takes on the screen
+        """
+        width = self.size
+        if isinstance(width, float):
+            if terminalWidth is None:
+                terminalWidth = shutil.get_terminal_size().columns
+            width = int(width * terminalWidth)
+        if self.minSize is not None:
+            width = max(width, self.minSize)
+        if self.maxSize is not None:
+            width = min(width, self.maxSize)
+        #the text between the paddings needs at least one column, otherwise it cannot be wrapped
+        return max(width, self.padding[1] + self.padding[3] + 1)
+
+
+    def getBodyIndent(self):
+        """Returns the body indent of the block. If the indent is set to auto, the body will indent with the
+           size of the headline. Since the headline can be longer than the block size, we need to take the modulus
+
+        Parameters:
+            None
+
+        Returns:
+            indent              (int)                   Number of spaces the body is indented with
+        """
+        if self.bodyIndent == "auto":
+            return len(self.headContent) % self.width
+        return self.bodyIndent
+
+
     def createEmptyBlock(size):
         """Emtpy Blocks are often required for padding purposes. This function just creaes an empty block.
 
@@ -236,29 +372,46 @@ class Block:
         return emptyBlock
         
 
-    def buildContent(self):
-        """Creates an array of formatted lines that are stored inside of self.content
+    def buildContent(self, maxLines=None, overflow=None, terminalWidth=None):
+        """Creates an array of formatted lines that are stored inside of self.content. If a line limit is
+           set, wrapping and highlighting stops once the limit is reached and the omitted lines are
+           summarized by a single overflow line.
 
         Parameters:
-            None
+            maxLines            (int)                   Chain-wide line limit. Only used if self.maxLines is None
+            overflow            (string)                Chain-wide overflow format. Only used if self.overflow is None
+            terminalWidth       (int)                   Width that relative sizes are resolved against
 
         Returns:
             None
         """
-        #if indent is set to auto, the body will indent with size of the headline
-        #since the headline can be longer than the block size, we need to take the modulus
-        if self.bodyIndent == "auto": 
-            self.bodyIndent = len(self.headContent) % self.size
-        if self.bodyColor == "":
-            self.bodyColor = "none"
-        if self.headColor == "":
-            self.headColor = "none"
+        (maxLines, overflow, cacheKey) = self.prepareContent(maxLines, overflow, terminalWidth)
+        if cacheKey in self.contentCache:
+            self.contentCache.move_to_end(cacheKey)
+            return self.contentCache[cacheKey]
+        bodyIndent = self.getBodyIndent()
 
         #if we put the raw input into textwrap, the output becomes wired if there are newlines 
         #present, since textwrapper counts them to the string length instead of a break.
         #therefore we split the input into lines first and invoke textwrap over all of them.
+        #for capped blocks the body is split lazily, since we only want to touch the lines we show
         headLines = self.headContent.splitlines()
-        bodyLines = self.bodyContent.splitlines()
+        if maxLines is None:
+            bodyLines = iter(self.bodyContent.splitlines())
+        else:
+            bodyLines = Block.iterLines(self.bodyContent)
+        firstBody = next(bodyLines, None)
+        consumedLines = 0 if firstBody is None else 1
+
+        #the first body line may be wrapped beside the headline, which is done in one go. For capped blocks
+        #we cut it to a prefix that is large enough to fill all available lines
+        firstCut = False
+        shownCharacters = 0
+        if maxLines is not None and firstBody is not None:
+            prefixSize = 2 * (maxLines + 2) * self.width
+            if len(firstBody) > prefixSize:
+                firstBody = firstBody[:prefixSize]
+                firstCut = True
 
         #Step 1: We wrap each line inside the headline of the block. This is probably always the
         #case, but who knows :)
@@ -274,62 +427,302 @@ class Block:
             #if the headline is seperated from the body by a newline, we only have to join the
             #headline output and the body output. If there is no newline between headline and
             #body we need to more work to get a nice formatted output
-            if not self.headNewline and bodyLines != []:
+            if not self.headNewline and firstBody is not None:
                 #we have to determine if there are spaces for body indentation left and append them
                 try:
-                    indentLeft = self.bodyIndent - Block.realLength(headLines[-1])
+                    indentLeft = bodyIndent - Block.realLength(headLines[-1])
                     headLines[-1] += ' ' * indentLeft
                 except IndexError:
                     #cases where the hadnline was empty has to be handeled seperatly
-                    indentLeft = self.bodyIndent
+                    indentLeft = bodyIndent
                     headLines.append(' ' * indentLeft)
                 #we have to determine how many characters the body text beside the headline can take.
                 #then we create a textwrap object for that size
-                charactersLeft = self.size - Block.realLength(headLines[-1]) - self.padding[1] - self.padding[3]
-                tmpTextWrapper = textwrap.TextWrapper();
-                tmpTextWrapper.replace_whitespace = False
-                tmpTextWrapper.width = charactersLeft
-                wrappedBody = tmpTextWrapper.wrap(bodyLines[0])
-                #we append the colored and wrapped first body line to the headline and remove it from
-                #the rest of the body
-                keywordsColored = self.highlightKeywords(wrappedBody[0])
-                headLines[-1] = headLines[-1] + coloredWrapper(keywordsColored, self.bodyColor)
-                if len(wrappedBody) > 1:
-                    bodyLines[0] = " ".join(wrappedBody[1:])
-                else:
-                    bodyLines.pop(0)
-
+                #then we create a textwrap object for that size. If the headline fills the whole block, the body
+                #starts on the next line
+                charactersLeft = self.width - Block.realLength(headLines[-1]) - self.padding[1] - self.padding[3]
+                if charactersLeft > 0:
+                    tmpTextWrapper = textwrap.TextWrapper();
+                    tmpTextWrapper.replace_whitespace = False
+                    tmpTextWrapper.width = charactersLeft
+                    wrappedBody = tmpTextWrapper.wrap(firstBody)
+                    #we append the colored and wrapped first body line to the headline and remove it from
+                    #the rest of the body
+                    shownCharacters = len(wrappedBody[0]) + 1
+                    keywordsColored = self.highlightKeywords(wrappedBody[0])
+                    headLines[-1] = headLines[-1] + coloredWrapper(keywordsColored, self.bodyColor)
+                    if len(wrappedBody) > 1:
+                        firstBody = " ".join(wrappedBody[1:])
+                    else:
+                        firstBody = None
+
+        if firstBody is not None:
+            bodyLines = itertools.chain([firstBody], bodyLines)
 
         #wrapping and coloring the body is straight forward
         textWrapper2 = self.createTextWrapper(initial=True)
-        wrappedBody = list(map(lambda x: textWrapper2.wrap(x), bodyLines))
-        bodyLines = itertools.chain(*wrappedBody)
-        bodyLines = list(map(lambda x: self.highlightKeywords(x), bodyLines))
+        if maxLines is None:
+            wrappedBody = list(map(lambda x: textWrapper2.wrap(x), bodyLines))
+            bodyLines = list(itertools.chain(*wrappedBody))
+            omittedLines = 0
+        else:
+            #the headline is always shown completely. The remaining lines of the limit are used for the body
+            bodyLines, completeLines = self.wrapLimited(textWrapper2, bodyLines, maxLines - len(headLines))
+            #if the first body line went completely beside the headline, it was not passed to wrapLimited
+            if firstBody is None:
+                completeLines += consumedLines
+            #a cut first line is never complete, even if its prefix was
+            if firstCut and (firstBody is None or completeLines):
+                completeLines -= 1
+            #lines that were not consumed are only counted and never wrapped. Each shown line was followed by
+            #a space or line break that is not part of the output
+            omittedLines = Block.countLines(self.bodyContent) - completeLines
+            shownCharacters += sum(len(line.lstrip()) + 1 for line in bodyLines)
+            omittedCharacters = max(len(self.bodyContent) - shownCharacters, 0)
+        bodyLines = self.highlightLines(bodyLines)
         bodyLines = list(map(lambda x: coloredWrapper(x, self.bodyColor), bodyLines))
+        if omittedLines:
+            #the overflow line is not wrapped and is cut if it does not fit into the block
+            overflowLine = textWrapper2.initial_indent + overflow.format(omittedLines, omittedCharacters)
+            overflowLine = overflowLine[:max(textWrapper2.width, len(textWrapper2.initial_indent) + 1)]
+            bodyLines.append(coloredWrapper(overflowLine, self.bodyColor))
 
         content = headLines + bodyLines
         #if head and body were empty, the print function will break. Therefore we insert an empty string in that case
         if content == []:
             content = [""]
-        return self.applyPadding(content)
+        content = self.applyPadding(content)
+        #builds that skipped risky keywords are not cached, since a later build may be able to highlight them
+        if Keyword.canInterrupt() or not any(keyword.risky and not keyword.disabled for keyword in self.keywords):
+            self.cacheContent(cacheKey, content)
+        return content
+
+
+    def prepareContent(self, maxLines=None, overflow=None, terminalWidth=None):
+        """Resolves the settings that are used by buildContent and computes the key of the content cache.
+
+        Parameters:
+            maxLines            (int)                   Chain-wide line limit. Only used if self.maxLines is None
+            overflow            (string)                Chain-wide overflow format. Only used if self.overflow is None
+            terminalWidth       (int)                   Width that relative sizes are resolved against
+
+        Returns:
+            maxLines            (int)                   Line limit of the block
+            overflow            (string)                Overflow format of the block
+            cacheKey            (tuple)                 Key of the content inside self.contentCache
+        """
+        self.width = self.resolveSize(terminalWidth)
+        if self.bodyColor == "":
+            self.bodyColor = "none"
+        if self.headColor == "":
+            self.headColor = "none"
+
+        #the block specific settings take precedence over the chain-wide defaults
+        if self.maxLines is not None:
+            maxLines = self.maxLines
+        if self.overflow is not None:
+            overflow = self.overflow
+        if overflow is None:
+            overflow = Block.defaultOverflow
+
+        #builds are cached per width and settings, so that switching between recently used
+        #terminal widths does not require to wrap and color the block again
+        cacheKey = (self.width, maxLines, overflow, self.headContent, self.headColor, self.headNewline, self.bodyContent,
+                    self.bodyColor, self.bodyIndent, tuple(self.padding), tuple(self.keywords.items()))
+        return (maxLines, overflow, cacheKey)
+
+
+    def cacheContent(self, cacheKey, content):
+        """Stores a build inside the content cache and removes the least recently used build if the cache is full.
+
+        Parameters:
+            cacheKey            (tuple)                 Key as returned by prepareContent
+            content             (array[str])            Content that was build for the key
+
+        Returns:
+            None
+        """
+        self.contentCache[cacheKey] = content
+        if len(self.contentCache) > Block.cacheSize:
+            self.contentCache.popitem(last=False)
+
+
+    def wrapLimited(self, textWrapper, lines, limit):
+        """Wraps the lines from an iterator until limit wrapped lines were produced. Long input lines are only
+           wrapped partially, so that the amount of work depends on the limit and not on the size of the input.
+
+        Parameters:
+            textWrapper         (TextWrapper)           Wrapper that is used for the lines
+            lines               (iterator[str])         Unwrapped input lines
+            limit               (int)                   Maximum number of wrapped lines
+
+        Returns:
+            wrappedLines        (array[str])            The wrapped lines, at most limit many
+            completeLines       (int)                   Number of input lines that fit completely into wrappedLines
+        """
+        wrappedLines = []
+        completeLines = 0
+        limit = max(limit, 0)
+        for line in lines:
+            left = limit - len(wrappedLines)
+            if left == 0:
+                break
+            #a prefix may cut a word short. This only changes the last two wrapped lines of the prefix, since
+            #textwrap fills the end of a line with the start of a word that is longer than the line. Therefore,
+            #the first left lines of the prefix equal the ones of the full line, as long as the prefix wraps
+            #into more than left + 1 lines. Otherwise we retry with a prefix of double size
+            chunkSize = (left + 2) * max(textWrapper.width, 1)
+            while True:
+                wrapped = textWrapper.wrap(line[:chunkSize])
+                if len(wrapped) > left + 1 or chunkSize >= len(line):
+                    break
+                chunkSize *= 2
+            if len(wrapped) > left:
+                wrappedLines += wrapped[:left]
+                break
+            wrappedLines += wrapped
+            completeLines += 1
+        return (wrappedLines, completeLines)
+
+
+    def iterLines(string):
+        """Lazy version of str.splitlines. This is used for capped Blocks, where we do not want to create a list of
+           all lines contained in a (possibly) huge body.
+
+        Parameters:
+            string              (string)                String that should be split
+
+        Returns:
+            Generator           (str)                   The lines from the string without the line break
+        """
+        start = 0
+        for match in Block.lineBreakPattern.finditer(string):
+            yield string[start:match.start()]
+            start = match.end()
+        if start < len(string):
+            yield string[start:]
+
+
+    def countLines(string):
+        """Returns the number of lines that Block.iterLines would produce for the specified string.
+
+        Parameters:
+            string              (string)                String for which the lines are counted
+
+        Returns:
+            count               (int)                   Number of lines inside the string
+        """
+        count = sum(1 for match in Block.lineBreakPattern.finditer(string))
+        return count + (string != "" and Block.lineBreakPattern.match(string[-1]) is None)
 
 
-    def buildBlockChain(self):
+    def buildBlockChain(self, maxLines=None, overflow=None, terminalWidth=None, parallel=False):
         """The content of block objects is not initialized until the buildContent() function is called. This function
            is a helper function which iterates over each Block object in the chain and calls builtContent() on them
 
         Parameters:
+            maxLines            (int)                   Default line limit for blocks that do not define their own
+            overflow            (string)                Default overflow format for blocks that do not define their own
+            terminalWidth       (int)                   Width that relative sizes are resolved against. Defaults to
+                                                        the current terminal width
+            parallel            (bool)                  Build large blocks concurrently using buildParallel first
+
+        Returns:
             None
+        """
+        if terminalWidth is None:
+            terminalWidth = shutil.get_terminal_size().columns
+        if parallel:
+            self.buildParallel(maxLines, overflow, terminalWidth)
+        for block in self.collectBlocks():
+            block.content = block.buildContent(maxLines, overflow, terminalWidth)
+            block.generator = block.buildGenerator()
+
+
+    def buildParallel(self, maxLines=None, overflow=None, terminalWidth=None, workers=None, threads=False):
+        """Builds the large blocks of the chain concurrently and stores the results inside their content caches.
+           Each block is build from a detached copy that does not contain neighbours or locks, so the result is
+           the same as for a sequential build. A following buildBlockChain only attaches the cached contents.
+           Blocks with less than Block.parallelThreshold characters are left for the sequential build. In thread
+           mode, this also applies to blocks with risky keywords, since these can only be interrupted inside the
+           main thread.
+
+        Parameters:
+            maxLines            (int)                   Default line limit for blocks that do not define their own
+            overflow            (string)                Default overflow format for blocks that do not define their own
+            terminalWidth       (int)                   Width that relative sizes are resolved against
+            workers             (int)                   Number of workers. Defaults to the number of processors
+            threads             (bool)                  Use a thread pool instead of a process pool
 
         Returns:
             None
         """
-        self.content = self.buildContent()
-        self.generator = self.buildGenerator()
-        if self.right: 
-            self.right.buildBlockChain()
-        if self.bottom:
-            self.bottom.buildBlockChain()
+        if terminalWidth is None:
+            terminalWidth = shutil.get_terminal_size().columns
+        buildArguments = (maxLines, overflow, terminalWidth)
+
+        pending = []
+        for block in self.collectBlocks():
+            if len(block.headContent) + len(block.bodyContent) < Block.parallelThreshold:
+                continue
+            if threads and any(keyword.risky for keyword in block.keywords):
+                continue
+            cacheKey = block.prepareContent(*buildArguments)[2]
+            if cacheKey not in block.contentCache:
+                pending.append((block, cacheKey))
+
+        #starting a pool is only worth it if there are at least two large blocks
+        if len(pending) < 2:
+            return
+
+        executor = concurrent.futures.ThreadPoolExecutor if threads else concurrent.futures.ProcessPoolExecutor
+        with executor(max_workers=workers) as pool:
+            futures = [pool.submit(buildDetached, block.detachBlock(), buildArguments) for block, cacheKey in pending]
+            for (block, cacheKey), future in zip(pending, futures):
+                block.cacheContent(cacheKey, future.result())
+
+
+    def detachBlock(self):
+        """Returns a copy of the block without neighbours, locks and built content. Detached blocks are small
+           enough to be send to other processes.
+
+        Parameters:
+            None
+
+        Returns:
+            detachedBlock       (Block)                 Copy of self that can be build independently
+        """
+        detachedBlock = copy.copy(self)
+        detachedBlock.right = None
+        detachedBlock.bottom = None
+        detachedBlock.lock = None
+        detachedBlock.vanishLock = None
+        detachedBlock.content = None
+        detachedBlock.generator = None
+        detachedBlock.contentCache = OrderedDict()
+        return detachedBlock
+
+
+    def collectBlocks(self):
+        """Returns all Blocks that are reachable from the current Block.
+
+        Parameters:
+            None
+
+        Returns:
+            blocks              (array[Block])          All Blocks inside the chain
+        """
+        blocks = []
+        seen = set()
+        pending = [self]
+        while pending:
+            current = pending.pop()
+            if current is None or id(current) in seen:
+                continue
+            seen.add(id(current))
+            blocks.append(current)
+            pending += [current.right, current.bottom]
+        return blocks
 
 
     def realLength(string):
@@ -342,11 +735,7 @@ class Block:
         Returns:
             length                  (int)               Length of the uncolored string.
         """
-        ESC = Literal('\x1b')
-        integer = Word(nums)
-        escapeSeq = Combine(ESC + '[' + Optional(delimitedList(integer,';')) + oneOf(list(alphas)))
-        nonAnsiString = lambda s : Suppress(escapeSeq).transformString(s)
-        uncoloredString = Suppress(escapeSeq).transformString(string)
+        uncoloredString = Block.escapePattern.sub('', string)
         return len(uncoloredString)
 
 
@@ -368,16 +757,31 @@ class Block:
         #insert padding infront of each lines
         lines = list(map(lambda x: " " * self.padding[3] + x, lines))
         #padding of the left site was alrady done by adjusting the wrapper size, but we may have to fill up!
-        lines = list(map(lambda x: x + " " * (self.size - Block.realLength(x)), lines))
+        lines = list(map(lambda x: x + " " * (self.width - Block.realLength(x)), lines))
         return lines
 
 
-    def masquaradeBottom(self, block):
+    def masquaradeBottom(self, block, buildArguments=None):
+        """Replaces the current block by its bottom neighbour. This is done once the current block is empty and the
+           bottom neighbour is unlocked. In on demand mode, the content of the bottom neighbour is build at this point.
+
+        Parameters:
+            block               (Block)                 The bottom neighbour of the block
+            buildArguments      (tuple)                 Arguments for buildContent if the block was not build yet
+
+        Returns:
+            None
+        """
+        if block.generator is None:
+            block.buildOnDemand(buildArguments)
 
         self.size = block.size
+        self.width = block.width
         self.padding = block.padding
         self.bottom = block.bottom
         self.lock = block.lock
+        #the vanishLock of the current block was already unlocked when its last line was printed
+        self.vanishLock = block.vanishLock
         self.content = block.content
         self.generator = block.generator
 
@@ -385,108 +789,240 @@ class Block:
         self.right = block.right
 
 
-    def printLine(self):
+    def buildOnDemand(self, buildArguments=None):
+        """Builds the content and generator of a single block. This is used by the on demand mode of printBlockChain,
+           where blocks are only build once their first line is printed.
+
+        Parameters:
+            buildArguments      (tuple)                 Arguments for buildContent (maxLines, overflow, terminalWidth)
+
+        Returns:
+            None
+        """
+        self.content = self.buildContent(*(buildArguments or ()))
+        self.generator = self.buildGenerator()
+
+
+    def printLine(self, buildArguments=None, row=None):
         """Print the next line of the current and all connected blocks. The algorithm is quite complicated because of possible neighbours
            and probably contained Locks between them. However, this is the core to understand and define how blocks are aligned inside 
            the output.
 
         Parameters:
-            None
+            buildArguments      (tuple)                 Arguments for buildContent that are used for blocks that were not
+                                                        build yet (maxLines, overflow, terminalWidth)
+            row                 (list)                  If specified, the lines are appended to this list instead of being
+                                                        printed and no newline is printed at the end of the row
 
         Returns:
             None
         """
+        #the blocks of the row are printed from left to right. Afterwards, the blocks that printed their last line
+        #are handled from right to left, since replacing a block by its bottom neighbour changes its right neighbours.
+        #Rows are not processed recursively, as they may contain more blocks than the recursion limit allows
+        printed = []
+        block = self
+        while block:
+            #in on demand mode blocks are build once they print their first line
+            if block.generator is None:
+                block.buildOnDemand(buildArguments)
+
+            #the block.generator object stores all lines of the block in a generator, aligned with the
+            #information if the line was the last one inside the generator
+            (line, last) = next(block.generator)
+            if row is None:
+                print(line, end="")
+            else:
+                row.append(line)
+
+            #if we have printed the last line of the block, we unlock the lock of our bottom neighbour
+            if last and block.bottom and block.bottom.lock:
+                block.bottom.lock.unlock()
+            if last and block.vanishLock:
+                block.vanishLock.unlock()
+
+            #if there are right neighbours, print their current row.
+            #if no right neigbour exists, print a newline
+            if block.right and block.right.vanishLock and block.right.vanishLock.isUnlocked():
+                block.right = block.right.right if block.right.right else None
+            printed.append((block, last))
+            block = block.right
+
+        if row is None:
+            print("")
+
         #this parameter is an indicator for the while loop. If some block in the chain has
         #still lines to print after printing the current row, it will set the parameter to true
         #before the function complete. If it stays false till we end, all blocks should be empty
         returnBool = False
+        for block, last in reversed(printed):
+            #if the printed line is the last one...
+            if last:
+                #and there is a bottom block
+                if block.bottom:
+                    #chek if the master lock of the bottom neighbour is unlocked
+                    if block.bottom.lock.master == None or block.bottom.lock.master.isUnlocked():
+                        #at this point our block is empty and our bottom is unlocked.
+                        #we just replace ourself with out bottom neighbor and inherint
+                        #our right neighbor to him. Now we have a fresh block and can 
+                        #continue with printing
+                        block.masquaradeBottom(block.bottom, buildArguments)
+                        returnBool = True
+                    #if our bottom is still locked, create a generator with a single newline.
+                    #this generator will be empty on next printLine and we check if our bottom
+                    #is then unlocked again
+                    else:
+                        block.generator = Block.blankGenerator(block.width)
+                        returnBool = True
+                #if no bottom is there, generate a generator with an empty line.
+                #this is required if other Blocks still have stuff to print.
+                #we do not set returnBool, since we have nothing more to say
+                else:
+                    block.generator = Block.blankGenerator(block.width)
 
-        #the self.generator object stores all lines of the block in a generator, aligned with the
-        #information if the line was the last one inside the generator
-        (line, last) = next(self.generator)
-        print(line, end="")
+            #if we have not printed the last line, we want to continue and set returnBool to True
+            else:
+                returnBool = True
+        return returnBool
 
-        #if we have printed the last line of the block, we unlock the lock of our bottom neighbour
-        if last and self.bottom and self.bottom.lock:
-            self.bottom.lock.unlock()
-        if last and self.vanishLock:
-            self.vanishLock.unlock()
 
+    def blankGenerator(width):
+        """Generator for blocks that have nothing to print. It contains a single blank line that is marked as the last one.
 
-        #if there are right neighbours, print their current row.
-        #if no right neigbour exists, print a newline
-        if self.right and self.right.vanishLock and self.right.vanishLock.isUnlocked():
-            self.right = self.right.right if self.right.right else None
-        if self.right:
-            returnBool = self.right.printLine() or returnBool
-        else:
-            print("")
+        Parameters:
+            width               (int)                   Width of the blank line
 
-        #if the printed line is the last one...
-        if last:
-            #and there is a bottom block
-            if self.bottom:
-                #chek if the master lock of the bottom neighbour is unlocked
-                if self.bottom.lock.master == None or self.bottom.lock.master.isUnlocked():
-                    #at this point our block is empty and our bottom is unlocked.
-                    #we just replace ourself with out bottom neighbor and inherint
-                    #our right neighbor to him. Now we have a fresh block and can 
-                    #continue with printing
-                    self.masquaradeBottom(self.bottom)
-                    returnBool = True
-                #if our bottom is still locked, create a generator with a single newline.
-                #this generator will be empty on next printLine and we check if our bottom
-                #is then unlocked again
-                else:
-                    blackMagic = lambda: [(yield( (" " * self.size, True)))]
-                    self.generator = blackMagic()
-                    returnBool = True
-            #if no bottom is there, generate a generator with an empty line.
-            #this is required if other Blocks still have stuff to print.
-            #we set returnBool to false, since we have nothing more to say
-            else:
-                blackMagic = lambda: [(yield( (" " * self.size, True)))]
-                self.generator = blackMagic()
-                returnBool = False or returnBool
-        
-        #if we have not printed the last line, we want to continue and set returnBool to True
-        else:
-            returnBool = True
-        return returnBool
+        Returns:
+            Generator           (str, bool)             The blank line along with True
+        """
+        yield (" " * width, True)
 
 
-    def printBlockChain(self):
+    def printBlockChain(self, maxLines=None, overflow=None, minimalSGR=False, onDemand=False):
         """Printing all rows from the current block and all his neighbours
 
         Parameters:
-            None
+            maxLines            (int)                   Default line limit that is used if the chain is not build yet
+            overflow            (string)                Default overflow format that is used if the chain is not build yet
+            minimalSGR          (bool)                  Pass the output through an SGREncoder to remove redundant escape codes
+            onDemand            (bool)                  Build blocks when their first line is printed instead of building
+                                                        the whole chain before printing
 
         Returns:
             None
         """
-        if not self.content:
-            self.buildBlockChain()
-        #just iterate over the block and print the lines
-        while self.printLine():
-            pass
-
-
-    def getBlockChain(self):
+        buildArguments = (maxLines, overflow, shutil.get_terminal_size().columns)
+        if not self.content and not onDemand:
+            self.buildBlockChain(*buildArguments)
+
+        if minimalSGR:
+            stdout = sys.stdout
+            sys.stdout = SGREncoder(stdout)
+        #just iterate over the block and print the lines. Each row is collected and printed at once
+        row = []
+        try:
+            while True:
+                printing = self.printLine(buildArguments, row)
+                print("".join(row))
+                row.clear()
+                if not printing:
+                    break
+        finally:
+            if minimalSGR:
+                sys.stdout.flush()
+                sys.stdout = stdout
+
+
+    def getBlockChain(self, maxLines=None, overflow=None, minimalSGR=False, onDemand=False):
         """Same as printBlockChain but instead of printing the blockChain it is returned
            as a string. 
 
         Parameters:
-            None
+            maxLines            (int)                   Default line limit that is used if the chain is not build yet
+            overflow            (string)                Default overflow format that is used if the chain is not build yet
+            minimalSGR          (bool)                  Pass the output through an SGREncoder to remove redundant escape codes
+            onDemand            (bool)                  Build blocks when their first line is printed
 
         Returns:
             blockChain          (string)             String representation of the blockChain
         """
+        #the previous stdout is restored, since it may be redirected by the caller
+        stdout = sys.stdout
         sys.stdout = blockChain = StringIO()
-        self.printBlockChain()
-        sys.stdout = sys.__stdout__
+        try:
+            self.printBlockChain(maxLines, overflow, minimalSGR, onDemand)
+        finally:
+            sys.stdout = stdout
         return blockChain.getvalue()
 
 
+    def printResponsive(self, maxLines=None, overflow=None, terminalWidth=None, minimalSGR=False):
+        """Resolves all sizes inside the chain against the terminal width and prints a copy of the chain. In contrast
+           to printBlockChain, the chain itself is not modified and can be printed again, e.g. after the terminal
+           was resized. Only blocks whose resolved width changed need to be wrapped again.
+
+        Parameters:
+            maxLines            (int)                   Default line limit for blocks that do not define their own
+            overflow            (string)                Default overflow format for blocks that do not define their own
+            terminalWidth       (int)                   Width that relative sizes are resolved against. Defaults to
+                                                        the current terminal width
+            minimalSGR          (bool)                  Pass the output through an SGREncoder to remove redundant escape codes
+
+        Returns:
+            None
+        """
+        self.buildBlockChain(maxLines, overflow, terminalWidth)
+        self.copyBlockChain().printBlockChain(minimalSGR=minimalSGR)
+
+
+    def watchResize(self, maxLines=None, overflow=None):
+        """Prints the chain responsive and installs a SIGWINCH handler that marks the chain as resized. The handler
+           does not print anything, since a resize may arrive while the output is written. Instead, the chain is
+           printed again by redrawResized, which is called outside of the handler, e.g. from the main loop:
+
+                Block1.watchResize()
+                while True:
+                    signal.pause()
+                    Block1.redrawResized()
+
+        Parameters:
+            maxLines            (int)                   Default line limit for blocks that do not define their own
+            overflow            (string)                Default overflow format for blocks that do not define their own
+
+        Returns:
+            handler             (callable)              The previously installed SIGWINCH handler
+        """
+        def resizeHandler(signum, frame):
+            self.resizePending = True
+
+        self.resizePending = False
+        previousHandler = signal.signal(signal.SIGWINCH, resizeHandler)
+        self.printResponsive(maxLines, overflow)
+        return previousHandler
+
+
+    def redrawResized(self, maxLines=None, overflow=None, clear=True):
+        """Prints the chain again if the terminal was resized since the last call. Resizes that arrive while the
+           chain is printed cause another redraw on the next call.
+
+        Parameters:
+            maxLines            (int)                   Default line limit for blocks that do not define their own
+            overflow            (string)                Default overflow format for blocks that do not define their own
+            clear               (bool)                  Clear the screen before the chain is printed again
+
+        Returns:
+            redrawn             (bool)                  True if the chain was printed again
+        """
+        if not self.resizePending:
+            return False
+        self.resizePending = False
+        if clear:
+            print("\x1b[2J\x1b[H", end="")
+        self.printResponsive(maxLines, overflow)
+        sys.stdout.flush()
+        return True
+
+
     def buildGenerator(self):
         """It turns out that for the print algorithm a generator of the Block contents is far
            more useful than a list. However, generators do not provide a check function if 
@@ -521,9 +1057,9 @@ class Block:
         #we want to allow newlines in the body
         textWrapper.replace_whitespace = False
         #to match the block size, we have to subtract it from the Wrapper size
-        textWrapper.width = self.size - (self.padding[1] + self.padding[3])
+        textWrapper.width = self.width - (self.padding[1] + self.padding[3])
         #subsequent lines have to have an indent of the specified body-indent
-        textWrapper.subsequent_indent = " " * self.bodyIndent
+        textWrapper.subsequent_indent = " " * self.getBodyIndent()
         #we may need initial indent (in case the head-separator contains a newline)
         if initial:
             textWrapper.initial_indent = textWrapper.subsequent_indent
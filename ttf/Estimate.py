@@ -0,0 +1,199 @@
+import math
+from .Block import Block, coloredWrapper
+
+
+class Estimate:
+    """Estimates are used to judge the cost of a Block chain before it is rendered. Wrapping and coloring large
+       Blocks can take a lot of time and an estimate allows to paginate, cap or refuse such a chain beforehand.
+       The estimate is computed from the content lengths, sizes and paddings of the Blocks and the alignment
+       caused by their Locks, but no text is wrapped or colored:
+
+            estimate = Estimate.fromBlockChain(Block1)
+            if estimate.bytes > 10 * 1024 * 1024:
+                Block1.printBlockChain(maxLines=100)
+
+        Word wrapping is approximated by reducing the line capacity by half of the average word length. The
+        error is usually below 10% for rows and bytes (see examples/estimate.py and tests/test_estimate.py). Bytes
+        are counted in UTF-8.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    """
+    #number of characters of each body that are searched for keywords to extrapolate the number of matches
+    sampleSize = 4096
+
+
+    def __init__(self):
+        """Creates a new and empty Estimate object.
+
+        Parameters:
+            None
+
+        Returns:
+            Estimate            (Estimate)          The new created Estimate object
+        """
+        self.rows = 0
+        self.columns = 0
+        self.blocks = 0
+        self.keywordWork = 0
+        self.keywordMatches = 0
+        self.bytes = 0
+
+
+    def __str__(self):
+        """Returns a short summary of the estimate.
+
+        Parameters:
+            None
+
+        Returns:
+            summary             (string)            Summary of the estimated values
+        """
+        return "rows: {}, columns: {}, blocks: {}, keyword work: {}, keyword matches: {}, bytes: {}".format(
+                self.rows, self.columns, self.blocks, self.keywordWork, self.keywordMatches, self.bytes)
+
+
+    def wrappedLines(length, capacity, wordLength):
+        """Estimates the number of lines a text line takes after wrapping.
+
+        Parameters:
+            length              (int)               Length of the text line
+            capacity            (int)               Characters that fit into a wrapped line
+            wordLength          (float)             Average length of the words inside the text
+
+        Returns:
+            lines               (int)               Estimated number of wrapped lines
+        """
+        if length == 0:
+            return 0
+        #words that are longer than a line are broken and fill their lines completely
+        if wordLength >= capacity:
+            wordLength = 0
+        capacity = max(capacity - wordLength / 2, 1)
+        return math.ceil(length / capacity)
+
+
+    def estimateBlock(self, block, maxLines=None, terminalWidth=None):
+        """Estimates the number of rows of a single Block and adds its keyword work and escape sequences to the
+           estimate.
+
+        Parameters:
+            block               (Block)             Block to estimate
+            maxLines            (int)               Chain-wide line limit. Only used if block.maxLines is None
+            terminalWidth       (int)               Width that relative sizes are resolved against
+
+        Returns:
+            rows                (int)               Estimated number of rows including padding
+        """
+        if block.maxLines is not None:
+            maxLines = block.maxLines
+        width = block.resolveSize(terminalWidth)
+        capacity = width - block.padding[1] - block.padding[3]
+        indent = len(block.headContent) % width if block.bodyIndent == "auto" else block.bodyIndent
+
+        headLines = sum(Estimate.wrappedLines(len(line), capacity, 0) for line in block.headContent.splitlines())
+
+        body = block.bodyContent
+        wordLength = len(body) / (body.count(" ") + body.count("\n") + 1)
+        bodyLines = 0
+        bodyCharacters = 0
+        overflowLine = 0
+        for line in Block.iterLines(body):
+            bodyLines += Estimate.wrappedLines(len(line), capacity - indent, wordLength)
+            bodyCharacters += len(line)
+            if maxLines is not None and headLines + bodyLines > maxLines:
+                bodyLines = max(maxLines - headLines, 0)
+                bodyCharacters = bodyLines * (capacity - indent)
+                overflowLine = 1
+                break
+
+        #if the body starts beside the headline, both share a line
+        lines = headLines + bodyLines + overflowLine
+        if not block.headNewline and bodyLines:
+            lines = max(headLines, 1) + bodyLines + overflowLine - 1
+
+        #text is counted in characters so far. Characters outside of ASCII take more than one byte in UTF-8,
+        #which is extrapolated for the body from the sample
+        sample = body[:Estimate.sampleSize]
+        bodyBytes = len(sample.encode()) / max(len(sample), 1)
+        self.bytes += len(block.headContent.encode()) - len(block.headContent)
+        self.bytes += round(bodyCharacters * (bodyBytes - 1))
+        if overflowLine:
+            overflow = block.overflow if block.overflow is not None else Block.defaultOverflow
+            self.bytes += len(overflow.encode()) - len(overflow)
+
+        #keywords are searched in each shown body line. The number of matches is extrapolated from a sample
+        matches = 0
+        if block.keywords and bodyCharacters:
+            for keyword in block.keywords:
+                matches += len(keyword.findall(sample))
+            matches = round(matches * bodyCharacters / max(len(sample), 1))
+        self.keywordWork += bodyCharacters * len(block.keywords)
+        self.keywordMatches += matches
+
+        #each colored line adds the escape sequences of its color. Keywords add their own color, a reset and
+        #the prefix of the body color behind them
+        bodyColor = block.bodyColor if block.bodyColor else "none"
+        headColor = block.headColor if block.headColor else "none"
+        bodyEscapes = len(coloredWrapper("", bodyColor))
+        headEscapes = len(coloredWrapper("", headColor))
+        keywordEscapes = 0
+        for color in block.keywords.values():
+            keywordEscapes += len(coloredWrapper("", color)) + len('\x1b[00m') + max(bodyEscapes - len('\x1b[0m'), 0)
+        keywordEscapes = keywordEscapes / len(block.keywords) if block.keywords else 0
+        self.bytes += headLines * headEscapes + (bodyLines + overflowLine) * bodyEscapes + round(matches * keywordEscapes)
+
+        self.blocks += 1
+        return max(lines, 1) + block.padding[0] + block.padding[2]
+
+
+    def estimateGenerator(width, rows):
+        """Generator that replaces the lines of a Block during the simulation of the printing.
+
+        Parameters:
+            width               (int)               Width of the Block
+            rows                (int)               Estimated number of rows of the Block
+
+        Returns:
+            Generator           (int, bool)         The width of the Block along with a bool that is true for the last row
+        """
+        for index in range(rows):
+            yield (width, index == rows - 1)
+
+
+    def fromBlockChain(block, maxLines=None, terminalWidth=None):
+        """Estimates the cost of rendering a Block chain. The alignment of the Blocks is computed by the printing
+           algorithm of the Block class, running on a copy of the chain whose Blocks contain estimated row counts.
+
+        Parameters:
+            block               (Block)             First Block of the chain
+            maxLines            (int)               Default line limit for blocks that do not define their own
+            terminalWidth       (int)               Width that relative sizes are resolved against
+
+        Returns:
+            estimate            (Estimate)          Estimated rows, columns, blocks, keyword work and UTF-8 encoded bytes
+        """
+        estimate = Estimate()
+
+        memo = {}
+        copiedBlock = block.copyBlockChain(memo)
+        for original in block.collectBlocks():
+            copied = memo[id(original)]
+            copied.width = original.resolveSize(terminalWidth)
+            rows = estimate.estimateBlock(original, maxLines, terminalWidth)
+            copied.generator = Estimate.estimateGenerator(copied.width, rows)
+
+        row = []
+        while True:
+            printing = copiedBlock.printLine(None, row)
+            columns = sum(item if isinstance(item, int) else len(item) for item in row)
+            estimate.columns = max(estimate.columns, columns)
+            estimate.bytes += columns + 1
+            estimate.rows += 1
+            row.clear()
+            if not printing:
+                break
+        return estimate
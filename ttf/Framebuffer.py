@@ -0,0 +1,322 @@
+import sys
+from array import array
+from .Block import Block
+from .SGREncoder import SGREncoder
+
+
+class Framebuffer:
+    """Framebuffers are an alternative rendering backend for Blocks. Instead of assembling each row of the output
+       from the lines of the different Blocks, a Framebuffer stores a fixed grid of cells. Each cell contains a
+       character and the id of its style. Blocks are blitted into the grid at arbitrary positions and may overlap
+       each other:
+
+            fb = Framebuffer(120, 40)
+            fb.blitBlockChain(Block1)
+            fb.blit(Block2, 5, 60, transparent=True)
+            fb.printFramebuffer()
+
+        Each row is encoded into a string with minimal SGR transitions once and only rows that changed since the
+        last encoding are encoded again.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    """
+
+
+    def __init__(self, width, height):
+        """Creates a new Framebuffer object with all cells set to blanks.
+
+        Parameters:
+            width               (int)               Number of columns of the Framebuffer
+            height              (int)               Number of rows of the Framebuffer
+
+        Returns:
+            Framebuffer         (Framebuffer)       The new created Framebuffer object
+        """
+        self.width = width
+        self.height = height
+
+        #style id 0 is always the default style of the terminal
+        self.styles = [SGREncoder.defaultState]
+        self.styleIds = {SGREncoder.defaultState: 0}
+
+        self.chars = [[" "] * width for row in range(height)]
+        self.cellStyles = [array('H', bytes(2 * width)) for row in range(height)]
+        self.encoded = [None] * height
+
+        #upper left position of each Block that was blitted by blitBlockChain
+        self.positions = {}
+
+
+    def getStyleId(self, state):
+        """Returns the id of an SGR state. States that were not used before get a new id.
+
+        Parameters:
+            state               (tuple)             State as (foreground, background, attributes)
+
+        Returns:
+            styleId             (int)               Id of the state inside self.styles
+        """
+        styleId = self.styleIds.get(state)
+        if styleId is None:
+            styleId = len(self.styles)
+            self.styles.append(state)
+            self.styleIds[state] = styleId
+        return styleId
+
+
+    def blitLines(self, lines, row, column, transparent=False):
+        """Writes lines containing ANSI escape sequences into the cells of the Framebuffer. Everything outside of
+           the Framebuffer is clipped.
+
+        Parameters:
+            lines               (array[str])        Lines to write
+            row                 (int)               Row of the first line
+            column              (int)               Column of the first character of each line
+            transparent         (bool)              Do not overwrite cells with blanks that have the default style
+
+        Returns:
+            None
+        """
+        for y, line in enumerate(lines, row):
+            if y < 0 or y >= self.height:
+                continue
+            chars = self.chars[y]
+            cellStyles = self.cellStyles[y]
+            state = SGREncoder.defaultState
+            styleId = 0
+            x = column
+
+            for part in SGREncoder.escapePattern.split(line):
+                if not part:
+                    continue
+                if part[0] == '\x1b':
+                    match = SGREncoder.sgrPattern.fullmatch(part)
+                    if match:
+                        state = SGREncoder.applyCodes(state, match.group(1))
+                        styleId = self.getStyleId(state)
+                    continue
+
+                start = max(x, 0)
+                end = min(x + len(part), self.width)
+                if start < end:
+                    text = part[start - x:end - x]
+                    if transparent and styleId == 0:
+                        for offset, char in enumerate(text, start):
+                            if char != " ":
+                                chars[offset] = char
+                                cellStyles[offset] = 0
+                    else:
+                        chars[start:end] = text
+                        cellStyles[start:end] = array('H', [styleId]) * (end - start)
+                x += len(part)
+
+            self.encoded[y] = None
+
+
+    def blit(self, block, row, column, transparent=False, terminalWidth=None):
+        """Writes the content of a Block into the Framebuffer. Blocks that were not build yet are build first.
+
+        Parameters:
+            block               (Block)             Block to write
+            row                 (int)               Row of the upper left corner
+            column              (int)               Column of the upper left corner
+            transparent         (bool)              Do not overwrite cells with blanks that have the default style
+            terminalWidth       (int)               Width that relative sizes are resolved against
+
+        Returns:
+            None
+        """
+        if block.content is None:
+            block.content = block.buildContent(terminalWidth=terminalWidth)
+        self.blitLines(block.content, row, column, transparent)
+
+
+    def fill(self, row, column, width, height):
+        """Resets the cells of a rectangle to blanks with the default style.
+
+        Parameters:
+            row                 (int)               Row of the upper left corner
+            column              (int)               Column of the upper left corner
+            width               (int)               Width of the rectangle
+            height              (int)               Height of the rectangle
+
+        Returns:
+            None
+        """
+        start = max(column, 0)
+        end = min(column + width, self.width)
+        for y in range(max(row, 0), min(row + height, self.height)):
+            if start < end:
+                self.chars[y][start:end] = [" "] * (end - start)
+                self.cellStyles[y][start:end] = array('H', bytes(2 * (end - start)))
+                self.encoded[y] = None
+
+
+    def layoutBlockChain(block, maxLines=None, overflow=None, terminalWidth=None):
+        """Computes the positions of all lines of a Block chain. This uses the same algorithm as printBlockChain,
+           but runs it on a copy of the chain whose generators yield positions instead of lines.
+
+        Parameters:
+            block               (Block)             First Block of the chain
+            maxLines            (int)               Default line limit for blocks that do not define their own
+            overflow            (string)            Default overflow format for blocks that do not define their own
+            terminalWidth       (int)               Width that relative sizes are resolved against
+
+        Returns:
+            placements          (array[tuple])      List of (row, column, block, lineIndex) for each line
+            size                (tuple)             Number of columns and rows of the chain
+        """
+        #building is cheap for blocks that were already build, since their content is cached
+        block.buildBlockChain(maxLines, overflow, terminalWidth)
+
+        memo = {}
+        copiedBlock = block.copyBlockChain(memo)
+        for original in block.collectBlocks():
+            memo[id(original)].generator = Framebuffer.placementGenerator(original)
+
+        placements = []
+        width = 0
+        y = 0
+        row = []
+        while True:
+            printing = copiedBlock.printLine((maxLines, overflow, terminalWidth), row)
+            x = 0
+            for item in row:
+                if isinstance(item, str):
+                    x += len(item)
+                else:
+                    placements.append((y, x) + item)
+                    x += item[0].width
+            width = max(width, x)
+            row.clear()
+            y += 1
+            if not printing:
+                break
+        return (placements, (width, y))
+
+
+    def placementGenerator(block):
+        """Generator that is used by layoutBlockChain. It yields the same information as Block.buildGenerator,
+           but contains the Block and line index instead of the line itself.
+
+        Parameters:
+            block               (Block)             Block to create the generator for
+
+        Returns:
+            Generator           (tuple, bool)       (block, lineIndex) along with a bool that is true for the last line
+        """
+        last = len(block.content) - 1
+        for index in range(len(block.content)):
+            yield ((block, index), index == last)
+
+
+    def blitBlockChain(self, block, row=0, column=0, maxLines=None, overflow=None, terminalWidth=None):
+        """Writes a Block chain into the Framebuffer. The chain is aligned as it would be by printBlockChain and
+           is not modified, so it can be blitted again.
+
+        Parameters:
+            block               (Block)             First Block of the chain
+            row                 (int)               Row of the upper left corner
+            column              (int)               Column of the upper left corner
+            maxLines            (int)               Default line limit for blocks that do not define their own
+            overflow            (string)            Default overflow format for blocks that do not define their own
+            terminalWidth       (int)               Width that relative sizes are resolved against
+
+        Returns:
+            None
+        """
+        placements, size = Framebuffer.layoutBlockChain(block, maxLines, overflow, terminalWidth)
+        for y, x, placedBlock, index in placements:
+            if index == 0:
+                self.positions[placedBlock] = (row + y, column + x)
+            self.blitLines(placedBlock.content[index:index + 1], row + y, column + x)
+
+
+    def fromBlockChain(block, maxLines=None, overflow=None, terminalWidth=None):
+        """Creates a Framebuffer that has the size of a Block chain and blits the chain into it.
+
+        Parameters:
+            block               (Block)             First Block of the chain
+            maxLines            (int)               Default line limit for blocks that do not define their own
+            overflow            (string)            Default overflow format for blocks that do not define their own
+            terminalWidth       (int)               Width that relative sizes are resolved against
+
+        Returns:
+            Framebuffer         (Framebuffer)       Framebuffer containing the chain
+        """
+        placements, (width, height) = Framebuffer.layoutBlockChain(block, maxLines, overflow, terminalWidth)
+        framebuffer = Framebuffer(width, height)
+        for y, x, placedBlock, index in placements:
+            if index == 0:
+                framebuffer.positions[placedBlock] = (y, x)
+            framebuffer.blitLines(placedBlock.content[index:index + 1], y, x)
+        return framebuffer
+
+
+    def encodeRow(self, row):
+        """Encodes a row of the Framebuffer into a string. Only the style transitions that are visible are emitted.
+
+        Parameters:
+            row                 (int)               Index of the row
+
+        Returns:
+            encoded             (string)            Encoded row without newline
+        """
+        if self.encoded[row] is not None:
+            return self.encoded[row]
+
+        chars = self.chars[row]
+        cellStyles = self.cellStyles[row]
+        encoded = []
+        current = 0
+        start = 0
+
+        #cells are processed in runs of the same style
+        for x in range(1, self.width + 1):
+            if x < self.width and cellStyles[x] == cellStyles[start]:
+                continue
+            styleId = cellStyles[start]
+            text = "".join(chars[start:x])
+            if styleId != current:
+                state = self.styles[styleId]
+                currentState = self.styles[current]
+                #whitespace does not need a transition, as long as it would look the same
+                if not (text.isspace() and SGREncoder.whitespaceState(state) == SGREncoder.whitespaceState(currentState)):
+                    encoded.append(SGREncoder.transition(currentState, state))
+                    current = styleId
+            encoded.append(text)
+            start = x
+
+        if current != 0:
+            encoded.append('\x1b[0m')
+        self.encoded[row] = "".join(encoded)
+        return self.encoded[row]
+
+
+    def render(self):
+        """Returns the content of the Framebuffer as string. Rows that did not change since the last call are
+           not encoded again.
+
+        Parameters:
+            None
+
+        Returns:
+            output              (string)            Encoded rows, each terminated by a newline
+        """
+        return "".join(self.encodeRow(row) + "\n" for row in range(self.height))
+
+
+    def printFramebuffer(self):
+        """Prints the content of the Framebuffer.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        sys.stdout.write(self.render())
@@ -0,0 +1,212 @@
+from .Block import Block
+from .Lock import Lock
+
+
+class Grid:
+    """Grids are a declarative way to define Block layouts. Instead of connecting Blocks by hand, Blocks are placed
+       into rows and columns and may span over several of them. The Grid creates the corresponding neighbourship
+       relationships and Locks on its own. The layout from Example 3 of the README would look like this:
+
+          grid = Grid([40, 40, 40, 40])
+          grid.add(Block1, 0, 0, rowSpan=3)
+          grid.add(Block2, 0, 1)
+          grid.add(Block3, 0, 2)
+          grid.add(Block4, 0, 3, rowSpan=3)
+          grid.add(Block5, 1, 1, columnSpan=2)
+          grid.add(Block6, 2, 1)
+          grid.add(Block7, 2, 2)
+
+        Each row of the grid is aligned by a Lock. Blocks in the row above a Block that spans over multiple
+        columns will vanish once the row is complete. Positions that are not covered by any Block are filled
+        with empty Blocks.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    """
+
+
+    def __init__(self, columnSizes):
+        """Creates a new Grid object.
+
+        Parameters:
+            columnSizes         (array[int])        Sizes of the different columns. Relative sizes are resolved to
+                                                    columns first. Blocks that span over multiple columns get the sum
+                                                    of the resolved column sizes as size
+
+        Returns:
+            Grid                (Grid)              The new created Grid object
+        """
+        self.columnSizes = columnSizes
+        self.rows = 0
+
+        #cells are stored as [block, row, column, rowSpan, columnSpan] by their id, so that fillers can be removed
+        #in constant time. The positions dictionary maps each covered (row, column) pair to the cell that covers it
+        self.cells = {}
+        self.positions = {}
+        #ids of the cells that were created by fillEmpty. These are replaced when a Block is added at their position
+        self.fillers = set()
+
+
+    def add(self, block, row, column, rowSpan=1, columnSpan=1):
+        """Places a Block inside the grid. The size of the Block is set to the size of the covered columns.
+
+        Parameters:
+            block               (Block)             Block to place
+            row                 (int)               Row of the upper left corner
+            column              (int)               Column of the upper left corner
+            rowSpan             (int)               Number of rows the block covers
+            columnSpan          (int)               Number of columns the block covers
+
+        Returns:
+            None
+        """
+        if row < 0 or column < 0 or rowSpan < 1 or columnSpan < 1:
+            raise ValueError("Invalid grid position ({}, {}) with span ({}, {})".format(row, column, rowSpan, columnSpan))
+        if column + columnSpan > len(self.columnSizes):
+            raise ValueError("Block at ({}, {}) exceeds the {} columns of the grid".format(row, column, len(self.columnSizes)))
+
+        covered = [(r, c) for r in range(row, row + rowSpan) for c in range(column, column + columnSpan)]
+        for position in covered:
+            if position in self.positions and id(self.positions[position]) in self.fillers:
+                self.removeCell(self.positions[position])
+            if position in self.positions:
+                raise ValueError("Block at ({}, {}) overlaps an existing Block at {}".format(row, column, position))
+
+        cell = [block, row, column, rowSpan, columnSpan]
+        self.cells[id(cell)] = cell
+        for position in covered:
+            self.positions[position] = cell
+        self.rows = max(self.rows, row + rowSpan)
+
+
+    def removeCell(self, cell):
+        """Removes a cell from the grid.
+
+        Parameters:
+            cell                (list)              Cell as stored inside self.cells
+
+        Returns:
+            None
+        """
+        block, row, column, rowSpan, columnSpan = cell
+        for r in range(row, row + rowSpan):
+            for c in range(column, column + columnSpan):
+                del self.positions[(r, c)]
+        del self.cells[id(cell)]
+        self.fillers.discard(id(cell))
+
+
+    def fillEmpty(self):
+        """Fills all positions of the grid that are not covered by a Block with empty Blocks.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        for row in range(self.rows):
+            for column in range(len(self.columnSizes)):
+                if (row, column) not in self.positions:
+                    self.add(Block.createEmptyBlock(self.columnSizes[column]), row, column)
+                    self.fillers.add(id(self.positions[(row, column)]))
+
+
+    def buildGrid(self, terminalWidth=None):
+        """Connects the Blocks of the grid and creates the Locks that are required to align the rows. Existing
+           neighbours and Locks of the Blocks are replaced.
+
+        Parameters:
+            terminalWidth       (int)               Width that relative column sizes are resolved against
+
+        Returns:
+            root                (Block)             The upper left Block of the grid. Printing this Block prints the grid
+        """
+        if not self.cells:
+            raise ValueError("Cannot build an empty grid")
+        self.fillEmpty()
+
+        #each column is resolved on its own, since relative and absolute sizes cannot be summed up and
+        #the sum of relative sizes may be rounded differently than the columns it spans
+        widths = [Block.createEmptyBlock(size).resolveSize(terminalWidth) for size in self.columnSizes]
+
+        starts = [[] for row in range(self.rows)]
+        for cell in self.cells.values():
+            block, row, column, _, columnSpan = cell
+            block.size = sum(widths[column:column + columnSpan])
+            block.right = None
+            block.bottom = None
+            block.lock = Lock(False)
+            block.vanishLock = None
+            starts[row].append(cell)
+
+        for row, cells in enumerate(starts):
+            cells.sort(key=lambda cell: cell[2])
+            rowLock = Lock()
+            left = None
+
+            for cell in cells:
+                block, _, column, rowSpan, columnSpan = cell
+
+                #in the first row, all blocks are simply chained together
+                if row == 0:
+                    if left:
+                        left[0].right = block
+                    left = cell
+                    continue
+
+                #the block becomes the bottom neighbour of the block above, if both start in the same column.
+                #otherwise the block above is splitted and the block is the right neighbour of its left one
+                above = self.positions[(row - 1, column)]
+                if above[2] == column:
+                    above[0].bottom = block
+                    block.addPrintMaster(rowLock)
+                else:
+                    left[0].right = block
+
+                #all other blocks above have to vanish to make space for the block
+                for spanColumn in range(column + 1, column + columnSpan):
+                    covered = self.positions[(row - 1, spanColumn)]
+                    if covered is above or covered[2] != spanColumn:
+                        continue
+                    if covered[2] + covered[4] > column + columnSpan:
+                        raise ValueError("Block at ({}, {}) partially covers the Block at ({}, {})".format(row, column, covered[1], covered[2]))
+                    covered[0].addVanishMaster(rowLock)
+                left = cell
+
+        return self.positions[(0, 0)][0]
+
+
+    def printGrid(self, maxLines=None, overflow=None, terminalWidth=None, minimalSGR=False):
+        """Prints the grid. The grid is not modified by printing and can be printed again.
+
+        Parameters:
+            maxLines            (int)               Default line limit for blocks that do not define their own
+            overflow            (string)            Default overflow format for blocks that do not define their own
+            terminalWidth       (int)               Width that relative sizes are resolved against
+            minimalSGR          (bool)              Pass the output through an SGREncoder to remove redundant escape codes
+
+        Returns:
+            None
+        """
+        self.buildGrid(terminalWidth).printResponsive(maxLines, overflow, terminalWidth, minimalSGR)
+
+
+    def getGrid(self, maxLines=None, overflow=None, terminalWidth=None, minimalSGR=False):
+        """Same as printGrid but instead of printing the grid it is returned as a string.
+
+        Parameters:
+            maxLines            (int)               Default line limit for blocks that do not define their own
+            overflow            (string)            Default overflow format for blocks that do not define their own
+            terminalWidth       (int)               Width that relative sizes are resolved against
+            minimalSGR          (bool)              Pass the output through an SGREncoder to remove redundant escape codes
+
+        Returns:
+            grid                (string)            String representation of the grid
+        """
+        root = self.buildGrid(terminalWidth)
+        root.buildBlockChain(maxLines, overflow, terminalWidth)
+        return root.copyBlockChain().getBlockChain(minimalSGR=minimalSGR)
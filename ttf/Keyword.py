@@ -0,0 +1,354 @@
+import re
+import time
+import signal
+import warnings
+import threading
+
+try:
+    from re import _parser as sre_parse
+    from re import _constants as sre_constants
+except ImportError:
+    import sre_parse
+    import sre_constants
+
+
+class KeywordTimeout(Exception):
+    """Raised by the alarm handler when a keyword exceeds its time budget.
+    """
+
+
+class Keyword:
+    """Keywords are highlighted inside the body of a Block. A keyword is either a regular expression or a literal
+       string. Literal keywords are replaced by str.replace and never reach the regex engine:
+
+            Block1.addKeyword("error", "red")
+            Block1.addKeyword("a+b (x)", "blue", literal=True)
+
+        Regular expressions are checked for nested quantifiers like '(a+)+' and overlapping alternatives like
+        '(a|aa)+', that may cause catastrophic backtracking. Such patterns are reported by a RuntimeWarning.
+        Additionally, highlighting a build with a regex keyword may take at most Keyword.budget seconds. Keywords
+        that exceed their budget are disabled and reported instead of blocking the rendering. Inside the main thread
+        the regex engine is interrupted by SIGALRM. Other threads, or an application that uses SIGALRM itself,
+        cannot be interrupted. There, the patterns that were reported are skipped for the current call only and the
+        duration of all other patterns is measured afterwards.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    """
+    #seconds that a regex keyword may spend on highlighting the lines of a single build
+    budget = 1.0
+
+    repeatOperators = {sre_constants.MAX_REPEAT, sre_constants.MIN_REPEAT}
+
+
+    def __init__(self, pattern, literal=False):
+        """Creates a new Keyword object. Invalid regular expressions raise a ValueError.
+
+        Parameters:
+            pattern             (string)            Regular expression or literal string to highlight
+            literal             (bool)              Match the pattern literally instead of as regular expression
+
+        Returns:
+            Keyword             (Keyword)           The new created Keyword object
+        """
+        self.pattern = pattern
+        self.literal = literal
+        self.disabled = False
+        self.warned = False
+        self.regex = None
+        self.risky = False
+
+        if literal:
+            return
+
+        try:
+            self.regex = re.compile("({})".format(pattern))
+        except re.error as e:
+            raise ValueError("Invalid keyword '{}': {}".format(pattern, e))
+
+        self.risky = Keyword.hasNestedQuantifier(sre_parse.parse(pattern))
+        if self.risky:
+            warnings.warn("Keyword '{}' may cause catastrophic backtracking. "
+                          "It is disabled if it exceeds {}s and skipped where it cannot be interrupted".format(pattern, Keyword.budget),
+                          RuntimeWarning, stacklevel=3)
+
+
+    def __repr__(self):
+        return "Keyword({!r}, literal={})".format(self.pattern, self.literal)
+
+
+    def __eq__(self, other):
+        #adding the same keyword again to a Block replaces its color instead of highlighting it twice
+        if not isinstance(other, Keyword):
+            return NotImplemented
+        return (self.pattern, self.literal) == (other.pattern, other.literal)
+
+
+    def __hash__(self):
+        return hash((self.pattern, self.literal))
+
+
+    def hasNestedQuantifier(items):
+        """Checks a parsed regular expression for repetitions whose required content consists of repetitions only,
+           e.g. '(a+)+' or '(\\w+\\s?)*', or of alternatives that may start with the same character, e.g. '(a|aa)+'.
+           These can match the same text in exponentially many ways.
+
+        Parameters:
+            items               (SubPattern)        Parsed regular expression
+
+        Returns:
+            nested              (bool)              True if a nested quantifier was found
+        """
+        for operator, argument in items:
+            if operator in Keyword.repeatOperators:
+                low, high, content = argument
+                if high > 1 and (Keyword.repeatsOnly(content) or Keyword.overlappingBranches(content)):
+                    return True
+                children = [content]
+            elif operator is sre_constants.SUBPATTERN:
+                children = [argument[-1]]
+            elif operator is sre_constants.BRANCH:
+                children = argument[1]
+            elif operator in (sre_constants.ASSERT, sre_constants.ASSERT_NOT):
+                children = [argument[1]]
+            else:
+                #atomic groups and possessive repeats never backtrack into their content
+                children = []
+            if any(Keyword.hasNestedQuantifier(child) for child in children):
+                return True
+        return False
+
+
+    def repeatsOnly(items):
+        """Checks whether the parts of a parsed regular expression that cannot match an empty string are all
+           repetitions without an upper bound of one.
+
+        Parameters:
+            items               (SubPattern)        Parsed content of a repetition
+
+        Returns:
+            repeatsOnly         (bool)              True if the content only consists of repetitions
+        """
+        while len(items) == 1 and items[0][0] is sre_constants.SUBPATTERN:
+            items = items[0][1][-1]
+
+        #content that may match an empty string completely, e.g. '(a*)*', is judged by all of its parts
+        required = [item for item in items if sre_parse.SubPattern(items.state, [item]).getwidth()[0] > 0] or list(items)
+        if not required:
+            return False
+        return all(operator in Keyword.repeatOperators and argument[1] > 1 for operator, argument in required)
+
+
+    def overlappingBranches(items):
+        """Checks whether the content of a repetition contains alternatives that may start with the same character.
+
+        Parameters:
+            items               (SubPattern)        Parsed content of a repetition
+
+        Returns:
+            overlapping         (bool)              True if two alternatives may start with the same character
+        """
+        while len(items) == 1 and items[0][0] is sre_constants.SUBPATTERN:
+            items = items[0][1][-1]
+
+        for operator, argument in items:
+            if operator is not sre_constants.BRANCH:
+                continue
+            seen = set()
+            for alternative in argument[1]:
+                first = Keyword.firstCharacters(alternative)
+                if first is None or first & seen:
+                    return True
+                seen |= first
+        return False
+
+
+    def firstCharacters(items):
+        """Returns the characters a parsed regular expression may start with, as far as they are easy to determine.
+
+        Parameters:
+            items               (SubPattern)        Parsed regular expression
+
+        Returns:
+            characters          (set)               Code points of the possible first characters or None if unknown
+        """
+        if len(items) == 0:
+            return None
+        operator, argument = items[0]
+        if operator is sre_constants.LITERAL:
+            return {argument}
+        if operator is sre_constants.SUBPATTERN:
+            return Keyword.firstCharacters(argument[-1])
+        if operator is sre_constants.IN and all(code is sre_constants.LITERAL for code, value in argument):
+            return {value for code, value in argument}
+        return None
+
+
+    def findall(self, string):
+        """Returns all occurrences of the keyword inside a string. Regex keywords are searched within the time budget.
+
+        Parameters:
+            string              (string)            String to search
+
+        Returns:
+            matches             (array[str])        Matched parts of the string. Empty if the keyword is disabled
+        """
+        if self.disabled:
+            return []
+        if self.literal:
+            return [self.pattern] * string.count(self.pattern)
+        return self.runBudgeted(self.regex.findall, [string], [])
+
+
+    def highlight(self, string, template):
+        """Highlights all occurrences of the keyword inside a string.
+
+        Parameters:
+            string              (string)            String in which the keyword should be highlighted
+            template            (string)            Format string that receives the matched text, e.g. the colored '{}'
+
+        Returns:
+            highlighted         (string)            String with the highlighted keyword
+        """
+        if self.literal:
+            return string.replace(self.pattern, template.format(self.pattern))
+        return self.regex.sub(template.format(r'\1'), string)
+
+
+    def highlightLines(self, lines, template):
+        """Highlights the keyword inside a list of lines. Regex keywords that exceed the time budget are disabled.
+           In this case, the lines are returned unchanged.
+
+        Parameters:
+            lines               (array[str])        Lines in which the keyword should be highlighted
+            template            (string)            Format string that receives the matched text
+
+        Returns:
+            highlighted         (array[str])        Lines with the highlighted keyword
+        """
+        if self.disabled:
+            return lines
+        if self.literal:
+            return [self.highlight(line, template) for line in lines]
+        highlight = lambda: [self.highlight(line, template) for line in lines]
+        return self.runBudgeted(highlight, [], lines)
+
+
+    def runBudgeted(self, function, arguments, default):
+        """Runs a function that uses the regex of the keyword within the time budget. If the budget is exceeded,
+           the keyword is disabled. Risky keywords are skipped if no alarm can be scheduled, which is reported once.
+
+        Parameters:
+            function            (function)          Function to run
+            arguments           (list)              Arguments for the function
+            default             (object)            Return value if the function was interrupted
+
+        Returns:
+            result              (object)            Return value of the function or default
+        """
+        alarm = Keyword.startAlarm()
+        #risky patterns could run forever if they cannot be interrupted. They are only skipped for this call,
+        #since later calls may happen inside the main thread again
+        if alarm is None and self.risky:
+            if not self.warned:
+                self.warned = True
+                warnings.warn("Keyword '{}' was skipped, since it cannot be interrupted outside of the main thread "
+                              "or while SIGALRM is in use".format(self.pattern), RuntimeWarning, stacklevel=3)
+            return default
+
+        start = time.monotonic()
+        try:
+            try:
+                result = function(*arguments)
+            finally:
+                Keyword.stopAlarm(alarm)
+        except KeywordTimeout:
+            #the alarm may also fire inside stopAlarm, before the previous handler was restored
+            Keyword.stopAlarm(alarm)
+            self.disable()
+            return default
+
+        #without an alarm, slow keywords are only noticed after they finished
+        if time.monotonic() - start > Keyword.budget:
+            self.disable()
+        return result
+
+
+    def disable(self):
+        """Disables the keyword after it exceeded its time budget and reports it by a RuntimeWarning.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        self.disabled = True
+        warnings.warn("Keyword '{}' exceeded its time budget of {}s and was disabled".format(self.pattern, Keyword.budget),
+                      RuntimeWarning, stacklevel=4)
+
+
+    def canInterrupt():
+        """Checks whether risky keywords can be interrupted at this point, which requires that the caller runs inside
+           the main thread and that SIGALRM is not used otherwise.
+
+        Parameters:
+            None
+
+        Returns:
+            interruptible       (bool)              True if startAlarm is able to schedule an alarm
+        """
+        if not hasattr(signal, "setitimer") or threading.current_thread() is not threading.main_thread():
+            return False
+        if signal.getsignal(signal.SIGALRM) not in (signal.SIG_DFL, signal.SIG_IGN) or signal.getitimer(signal.ITIMER_REAL)[0]:
+            return False
+        return True
+
+
+    def startAlarm():
+        """Schedules SIGALRM after Keyword.budget seconds. This is only possible inside the main thread and if
+           SIGALRM is not used otherwise.
+
+        Parameters:
+            None
+
+        Returns:
+            handler             (function)          The previous SIGALRM handler or None if no alarm was scheduled
+        """
+        if not Keyword.canInterrupt():
+            return None
+
+        handler = signal.signal(signal.SIGALRM, Keyword.alarmHandler)
+        signal.setitimer(signal.ITIMER_REAL, Keyword.budget)
+        return handler
+
+
+    def stopAlarm(handler):
+        """Cancels an alarm that was scheduled by startAlarm and restores the previous SIGALRM handler.
+
+        Parameters:
+            handler             (function)          Return value of startAlarm
+
+        Returns:
+            None
+        """
+        if handler is None:
+            return
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, handler)
+
+
+    def alarmHandler(signum, frame):
+        """Signal handler for SIGALRM that interrupts the keyword that is currently highlighted.
+
+        Parameters:
+            signum              (int)               Number of the received signal
+            frame               (frame)             Current stack frame
+
+        Returns:
+            None
+        """
+        raise KeywordTimeout()
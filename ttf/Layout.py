@@ -0,0 +1,187 @@
+import json
+from collections import OrderedDict
+from .Block import Block
+from .Lock import Lock
+
+
+class Record(dict):
+    """Dictionary that is used to fill the templates of a Layout. Fields that are missing inside a record are
+       replaced by an empty string instead of raising an exception.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    """
+
+    def __missing__(self, key):
+        return ""
+
+
+class Layout:
+    """Layouts are Block chains that are defined by a specification instead of code. The specification is a dictionary
+       (usually loaded from JSON) that contains the constructor arguments of the Blocks and Locks and the names
+       of their neighbours:
+
+          {
+            "root": "name",
+            "locks": {"row1": {"unlocked": true}},
+            "blocks": {
+              "name": {"size": 30, "padding": [0, 5, 1, 0], "head": ["Name: ", "yellow#bold", false],
+                       "body": ["{name}", "blue#bold", "auto"], "right": "info"},
+              "info": {"size": 50, "head": ["Info: ", "yellow#bold", false], "body": ["{info}", "none", "auto"],
+                       "keywords": [["error", "red#bold"], ["[warn]", "yellow", true]]}
+            }
+          }
+
+        The contents of head and body are format strings that are filled with the fields of a record when the
+        layout is rendered. The Blocks, Locks and keywords are only created once and copied for each record.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    """
+    blockArguments = {"size", "padding", "head", "body", "unlocked", "maxLines", "overflow", "minSize", "maxSize"}
+    blockKeys = blockArguments | {"right", "bottom", "printMaster", "vanishMaster", "keywords"}
+
+
+    def __init__(self, spec):
+        """Creates a new Layout object from the specified specification.
+
+        Parameters:
+            spec                (dict)              Specification of the layout as described in the class documentation
+
+        Returns:
+            Layout              (Layout)            The new created Layout object
+        """
+        self.maxLines = spec.get("maxLines")
+        self.overflow = spec.get("overflow")
+        self.separator = spec.get("separator", "")
+
+        #locks can be specified as list of names or as dictionary containing the constructor arguments
+        lockSpecs = spec.get("locks", {})
+        if isinstance(lockSpecs, list):
+            lockSpecs = {name: {} for name in lockSpecs}
+        self.locks = {name: Lock(lockSpec.get("unlocked", True)) for name, lockSpec in lockSpecs.items()}
+        for name, lockSpec in lockSpecs.items():
+            if lockSpec.get("master"):
+                self.locks[name].master = self.getLock(lockSpec["master"])
+                self.locks[name].makeSlave(self.locks[name].master)
+
+        blockSpecs = spec.get("blocks", {})
+        if not blockSpecs:
+            raise ValueError("Layout does not contain any blocks")
+
+        self.blocks = {}
+        for name, blockSpec in blockSpecs.items():
+            unknown = set(blockSpec) - Layout.blockKeys
+            if unknown:
+                raise ValueError("Unknown properties for block '{}': {}".format(name, ", ".join(sorted(unknown))))
+            arguments = {key: value for key, value in blockSpec.items() if key in Layout.blockArguments}
+            try:
+                block = Block(**arguments)
+                #keywords are [keyword, color] pairs with an optional third element that enables literal matching
+                for keyword in blockSpec.get("keywords", []):
+                    block.addKeyword(*keyword)
+            except (IndexError, KeyError, TypeError) as e:
+                raise ValueError("Invalid properties for block '{}': {}".format(name, e))
+            if blockSpec.get("printMaster"):
+                block.addPrintMaster(self.getLock(blockSpec["printMaster"]))
+            if blockSpec.get("vanishMaster"):
+                block.addVanishMaster(self.getLock(blockSpec["vanishMaster"]))
+            self.blocks[name] = block
+
+        for name, blockSpec in blockSpecs.items():
+            if blockSpec.get("right"):
+                self.blocks[name].right = self.getBlock(blockSpec["right"])
+            if blockSpec.get("bottom"):
+                self.blocks[name].bottom = self.getBlock(blockSpec["bottom"])
+
+        self.root = self.getBlock(spec.get("root", next(iter(blockSpecs))))
+
+        #each block needs to be reachable from the root block, otherwise it would never be printed
+        memo = {}
+        self.root.copyBlockChain(memo)
+        unreachable = [name for name, block in self.blocks.items() if id(block) not in memo]
+        if unreachable:
+            raise ValueError("Blocks not reachable from '{}': {}".format(spec.get("root", ""), ", ".join(unreachable)))
+
+        #blocks without fields in their templates keep their content cache, since their content never changes
+        self.templates = [name for name, block in self.blocks.items() if "{" in block.headContent or "{" in block.bodyContent]
+
+
+    def fromFile(path):
+        """Loads a Layout from a JSON file.
+
+        Parameters:
+            path                (string)            Path of the JSON file
+
+        Returns:
+            Layout              (Layout)            The Layout defined inside the file
+        """
+        with open(path) as specFile:
+            return Layout(json.load(specFile))
+
+
+    def getBlock(self, name):
+        """Returns the Block with the specified name or raises a ValueError if it does not exist.
+
+        Parameters:
+            name                (string)            Name of the Block inside the specification
+
+        Returns:
+            block               (Block)             The corresponding Block object
+        """
+        if name not in self.blocks:
+            raise ValueError("Unknown block '{}'".format(name))
+        return self.blocks[name]
+
+
+    def getLock(self, name):
+        """Returns the Lock with the specified name or raises a ValueError if it does not exist.
+
+        Parameters:
+            name                (string)            Name of the Lock inside the specification
+
+        Returns:
+            lock                (Lock)              The corresponding Lock object
+        """
+        if name not in self.locks:
+            raise ValueError("Unknown lock '{}'".format(name))
+        return self.locks[name]
+
+
+    def render(self, record, terminalWidth=None, minimalSGR=False):
+        """Renders the layout for a single record.
+
+        Parameters:
+            record              (dict)              Values for the fields inside the head and body templates
+            terminalWidth       (int)               Width that relative sizes are resolved against
+            minimalSGR          (bool)              Pass the output through an SGREncoder to remove redundant escape codes
+
+        Returns:
+            output              (string)            The rendered Block chain. Records that do not fit the templates
+                                                    raise a ValueError
+        """
+        if not isinstance(record, dict):
+            raise ValueError("Records need to be JSON objects, got {}".format(type(record).__name__))
+        values = Record(record)
+
+        memo = {}
+        root = self.root.copyBlockChain(memo)
+        for name in self.templates:
+            block = self.blocks[name]
+            copiedBlock = memo[id(block)]
+            #fields like {x[k]} or {x.y} may not fit the structure of the record
+            try:
+                copiedBlock.headContent = block.headContent.format_map(values)
+                copiedBlock.bodyContent = block.bodyContent.format_map(values)
+            except (IndexError, KeyError, TypeError, AttributeError) as e:
+                raise ValueError("Cannot fill the templates of block '{}': {} {}".format(name, type(e).__name__, e))
+            copiedBlock.contentCache = OrderedDict()
+
+        root.buildBlockChain(self.maxLines, self.overflow, terminalWidth)
+        return root.getBlockChain(minimalSGR=minimalSGR) + self.separator
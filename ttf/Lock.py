@@ -61,6 +61,28 @@ class Lock:
         return clonedLock
 
 
+    def copyLock(self, memo):
+        """Creates a copy of the Lock together with copies of its master and sublocks. In contrast to clone,
+           the copy is not appended to the original master, but to the copy of it.
+
+        Parameters:
+            memo                (dict)              Already copied objects, indexed by their id
+
+        Returns:
+            copiedLock          (Lock)              copy from self with same state
+        """
+        if id(self) in memo:
+            return memo[id(self)]
+
+        copiedLock = Lock(self.unlocked)
+        memo[id(self)] = copiedLock
+
+        if self.master:
+            copiedLock.master = self.master.copyLock(memo)
+        copiedLock.sublocks = [sublock.copyLock(memo) for sublock in self.sublocks]
+        return copiedLock
+
+
     def unlock(self):
         """Changes the state of a Lock from locked to unlocked. This is only true for the lock itself
            and does not affect sublocks. Notice that a Lock is considered locked until all sublocks are
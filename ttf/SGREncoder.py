@@ -0,0 +1,227 @@
+import re
+import sys
+
+
+class SGREncoder:
+    """Output stage that removes redundant ANSI escape sequences. The Block class colors each line, headline, body
+       and keyword seperatly, which leads to many sequences that are immediately overwritten or that change the
+       style of whitespace only. The SGREncoder buffers the output until a row is complete, tracks the SGR state
+       the terminal would be in and emits only the transitions that change the visible output:
+
+            \\x1b[1m\\x1b[34mfoo\\x1b[0m     \\x1b[1m\\x1b[34mbar\\x1b[0m      ->      \\x1b[1;34mfoo     bar\\x1b[0m
+
+       The encoder is a file like object and can be used as a replacement for sys.stdout.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    """
+    sgrPattern = re.compile('\x1b\\[([0-9;]*)m')
+    escapePattern = re.compile('(\x1b\\[[0-9;?]*[A-Za-z])')
+
+    #attribute codes and the codes that remove them again. Bold and dark are both removed by 22
+    removalCodes = {1: 22, 2: 22, 3: 23, 4: 24, 5: 25, 7: 27, 8: 28, 9: 29}
+    #attributes that change the appearance of whitespace. Everything else only affects glyphs
+    whitespaceCodes = {4, 7, 9}
+
+    defaultState = (None, None, frozenset())
+
+
+    def __init__(self, stream=None):
+        """Creates a new SGREncoder that writes the encoded rows to the specified stream.
+
+        Parameters:
+            stream              (file)              Stream the encoded output is written to. Defaults to sys.stdout
+
+        Returns:
+            SGREncoder          (SGREncoder)        The new created SGREncoder object
+        """
+        self.stream = stream if stream else sys.stdout
+        self.buffer = []
+
+
+    def write(self, string):
+        """Buffers the string until a row is complete. Complete rows are encoded and written to the stream.
+
+        Parameters:
+            string              (string)            Output that should be written
+
+        Returns:
+            length              (int)               Length of the string
+        """
+        rows = string.split("\n")
+        for row in rows[:-1]:
+            self.buffer.append(row)
+            self.stream.write(SGREncoder.encode("".join(self.buffer)) + "\n")
+            self.buffer = []
+        if rows[-1]:
+            self.buffer.append(rows[-1])
+        return len(string)
+
+
+    def flush(self):
+        """Encodes the incomplete row inside the buffer (if any) and flushes the underlying stream.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        if self.buffer:
+            self.stream.write(SGREncoder.encode("".join(self.buffer)))
+            self.buffer = []
+        self.stream.flush()
+
+
+    def encode(row):
+        """Encodes a single row. The row starts and ends in the default state of the terminal, everything in
+           between is reduced to the transitions that are visible.
+
+        Parameters:
+            row                 (string)            Row containing ANSI escape sequences
+
+        Returns:
+            encoded             (string)            Row with the minimal set of SGR transitions
+        """
+        encoded = []
+        current = SGREncoder.defaultState
+        desired = SGREncoder.defaultState
+
+        for part in SGREncoder.escapePattern.split(row):
+            if not part:
+                continue
+            if part[0] == '\x1b':
+                match = SGREncoder.sgrPattern.fullmatch(part)
+                if match:
+                    desired = SGREncoder.applyCodes(desired, match.group(1))
+                else:
+                    encoded.append(part)
+                continue
+
+            #whitespace is only affected by a few attributes. As long as they match, we can skip the transition
+            #for now and let the next visible character decide about the required codes
+            if part.isspace():
+                if SGREncoder.whitespaceState(current) == SGREncoder.whitespaceState(desired):
+                    encoded.append(part)
+                    continue
+            if current != desired:
+                encoded.append(SGREncoder.transition(current, desired))
+                current = desired
+            encoded.append(part)
+
+        if current != SGREncoder.defaultState:
+            encoded.append('\x1b[0m')
+        return "".join(encoded)
+
+
+    def applyCodes(state, parameters):
+        """Applies the parameters of an SGR sequence to the specified state.
+
+        Parameters:
+            state               (tuple)             Current state as (foreground, background, attributes)
+            parameters          (string)            Parameter string of the SGR sequence, e.g. '1;34'
+
+        Returns:
+            state               (tuple)             The new state
+        """
+        foreground, background, attributes = state
+        attributes = set(attributes)
+        codes = [int(code) if code else 0 for code in parameters.split(";")]
+
+        ctr = 0
+        while ctr < len(codes):
+            code = codes[ctr]
+            if code == 0:
+                foreground, background = None, None
+                attributes.clear()
+            elif code in SGREncoder.removalCodes:
+                attributes.add(code)
+            elif code in (38, 48):
+                #extended colors are 38;5;n or 38;2;r;g;b and are stored as a whole
+                length = 3 if codes[ctr + 1:ctr + 2] == [5] else 5
+                color = ";".join(map(str, codes[ctr:ctr + length]))
+                if code == 38:
+                    foreground = color
+                else:
+                    background = color
+                ctr += length - 1
+            elif 30 <= code <= 37 or 90 <= code <= 97:
+                foreground = str(code)
+            elif 40 <= code <= 47 or 100 <= code <= 107:
+                background = str(code)
+            elif code == 39:
+                foreground = None
+            elif code == 49:
+                background = None
+            elif code == 22:
+                attributes -= {1, 2}
+            elif code in SGREncoder.removalCodes.values():
+                attributes.discard(code - 20)
+            else:
+                #unknown codes are kept as they are. They can only be removed by a reset
+                attributes.add(str(code))
+            ctr += 1
+
+        return (foreground, background, frozenset(attributes))
+
+
+    def whitespaceState(state):
+        """Returns the part of a state that is visible on whitespace characters.
+
+        Parameters:
+            state               (tuple)             State as (foreground, background, attributes)
+
+        Returns:
+            state               (tuple)             Colors and attributes that are visible on whitespace
+        """
+        foreground, background, attributes = state
+        visible = frozenset(code for code in attributes if code in SGREncoder.whitespaceCodes or isinstance(code, str))
+        #reverse video shows the foreground as background and underline or strike through are drawn in the
+        #foreground color. Unknown codes may do the same
+        if not visible:
+            foreground = None
+        return (foreground, background, visible)
+
+
+    def transition(current, desired):
+        """Creates the shortest SGR sequence that changes the current state into the desired state. This is
+           either an incremental change or a reset followed by the complete desired state.
+
+        Parameters:
+            current             (tuple)             State of the terminal
+            desired             (tuple)             State that should be reached
+
+        Returns:
+            sequence            (string)            SGR sequence for the transition
+        """
+        foreground, background, attributes = desired
+        codes = sorted(attributes, key=str)
+        if foreground:
+            codes.append(foreground)
+        if background:
+            codes.append(background)
+        full = ["0"] + [str(code) for code in codes]
+
+        incremental = None
+        removed = current[2] - attributes
+        if all(code in SGREncoder.removalCodes for code in removed):
+            incremental = []
+            readd = set()
+            for code in sorted(removed):
+                incremental.append(str(SGREncoder.removalCodes[code]))
+                #22 removes bold and dark together
+                if code in (1, 2):
+                    readd |= {1, 2} & attributes
+            added = sorted((attributes - current[2]) | readd, key=str)
+            incremental = sorted(set(incremental), key=incremental.index) + [str(code) for code in added]
+            if foreground != current[0]:
+                incremental.append(foreground if foreground else "39")
+            if background != current[1]:
+                incremental.append(background if background else "49")
+
+        if incremental is not None and len(";".join(incremental)) < len(";".join(full)):
+            return '\x1b[{}m'.format(";".join(incremental))
+        return '\x1b[{}m'.format(";".join(full))
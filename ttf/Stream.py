@@ -0,0 +1,162 @@
+import sys
+import time
+import shutil
+import threading
+from collections import deque
+from .Block import Block
+from .SGREncoder import SGREncoder
+
+
+class Stream:
+    """Streams are used for output that grows while it is printed, e.g. when monitoring events of different services.
+       A Stream consists of columns and Blocks can be appended to the bottom of each column at any time:
+
+           ----------      ----------      ----------
+          |  Event0  |    |  Event1  |    |  Event2  |
+          |          |     ----------     |          |
+          |          |     ----------      ----------
+           ----------     |  Event3  |          .
+           ----------     |          |          .
+          |  Event4  |     ----------           .
+               .               .
+
+        A row is printed as soon as every column has a line for it. If some columns stay empty for longer than
+        the timeout, the row is printed with blank filler for these columns. Blocks are build when they are
+        appended and only their remaining lines are kept until they were printed.
+
+    Parameters:
+        None
+
+    Returns:
+        None
+    """
+
+
+    def __init__(self, columnSizes, timeout=1.0, maxLines=None, overflow=None, terminalWidth=None):
+        """Creates a new Stream object.
+
+        Parameters:
+            columnSizes         (array[int])        Sizes of the different columns. Appended Blocks get the size of their column
+            timeout             (float)             Seconds to wait for missing columns before a row is printed with filler
+            maxLines            (int)               Default line limit for appended blocks that do not define their own
+            overflow            (string)            Default overflow format for appended blocks that do not define their own
+            terminalWidth       (int)               Width that relative column sizes are resolved against. Defaults to
+                                                    the terminal width when the Stream is created
+
+        Returns:
+            Stream              (Stream)            The new created Stream object
+        """
+        self.columnSizes = columnSizes
+        self.timeout = timeout
+        self.maxLines = maxLines
+        self.overflow = overflow
+
+        #relative sizes are resolved once, so that the rows stay aligned if the terminal is resized
+        if terminalWidth is None:
+            terminalWidth = shutil.get_terminal_size().columns
+        self.terminalWidth = terminalWidth
+        self.widths = [Block.createEmptyBlock(size).resolveSize(terminalWidth) for size in columnSizes]
+        self.columns = [deque() for size in columnSizes]
+
+        #waitingSince is the time where the first column received lines that could not be printed yet
+        self.condition = threading.Condition()
+        self.waitingSince = None
+        self.closed = False
+
+
+    def append(self, column, block):
+        """Appends a Block to the bottom of a column. This function can be called from any thread. The size of the
+           Block is replaced by the width of the column.
+
+        Parameters:
+            column              (int)               Index of the column
+            block               (Block)             Block to append
+
+        Returns:
+            None
+        """
+        #the block is build with the resolved width of the column, so that its own size limits cannot widen it.
+        #Building happens outside of the condition, since it may take a while for large blocks
+        block.size = self.widths[column]
+        block.minSize = None
+        block.maxSize = None
+        content = block.buildContent(self.maxLines, self.overflow, self.terminalWidth)
+
+        with self.condition:
+            if self.closed:
+                raise ValueError("Cannot append to a closed Stream")
+            self.columns[column].extend(content)
+            if self.waitingSince is None:
+                self.waitingSince = time.monotonic()
+            self.condition.notify()
+
+
+    def close(self):
+        """Closes the Stream. Remaining lines are printed with filler and printStream returns afterwards.
+
+        Parameters:
+            None
+
+        Returns:
+            None
+        """
+        with self.condition:
+            self.closed = True
+            self.condition.notify()
+
+
+    def takeRows(self, fill=False):
+        """Removes the rows that can be printed from the columns. Has to be called while holding the condition.
+
+        Parameters:
+            fill                (bool)              Also take rows that are incomplete and fill them with blanks
+
+        Returns:
+            rows                (array[str])        The printable rows
+        """
+        rows = []
+        while all(self.columns) or (fill and any(self.columns)):
+            row = [column.popleft() if column else " " * width for column, width in zip(self.columns, self.widths)]
+            rows.append("".join(row))
+
+        #the timeout starts again for the lines that are left over
+        if rows or not any(self.columns):
+            self.waitingSince = time.monotonic() if any(self.columns) else None
+        return rows
+
+
+    def printStream(self, minimalSGR=False):
+        """Prints the rows of the Stream until it is closed. This function blocks and is usually called in a
+           different thread than the one appending the Blocks.
+
+        Parameters:
+            minimalSGR          (bool)              Pass the output through an SGREncoder to remove redundant escape codes
+
+        Returns:
+            None
+        """
+        output = SGREncoder(sys.stdout) if minimalSGR else sys.stdout
+
+        while True:
+            with self.condition:
+                rows = self.takeRows()
+                while not rows:
+                    if self.closed:
+                        rows = self.takeRows(fill=True)
+                        break
+                    if self.waitingSince is None:
+                        self.condition.wait()
+                    else:
+                        remaining = self.waitingSince + self.timeout - time.monotonic()
+                        if remaining <= 0:
+                            rows = self.takeRows(fill=True)
+                            break
+                        self.condition.wait(remaining)
+                    rows = self.takeRows()
+                done = self.closed and not any(self.columns)
+
+            for row in rows:
+                output.write(row + "\n")
+            output.flush()
+            if done:
+                return
@@ -1,4 +1,11 @@
 from .Block import *
 from .Lock import *
+from .Keyword import *
+from .Grid import *
+from .Framebuffer import *
+from .Estimate import *
+from .Layout import *
+from .Stream import *
+from .SGREncoder import *
 
 name = "ttf"
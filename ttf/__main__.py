@@ -0,0 +1,120 @@
+import os
+import sys
+import json
+import argparse
+import itertools
+import multiprocessing
+from .Layout import Layout
+
+parser = argparse.ArgumentParser(prog="python -m ttf", description="Renders NDJSON records from stdin through a ttf layout")
+parser.add_argument("layout", help="JSON file containing the layout specification")
+parser.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+parser.add_argument("--batch-size", type=int, default=512, help="number of records per batch (default: 512)")
+parser.add_argument("--width", type=int, help="terminal width for relative block sizes")
+parser.add_argument("--max-lines", type=int, help="default line limit for the blocks of the layout")
+parser.add_argument("--minimal-sgr", action="store_true", help="remove redundant escape sequences from the output")
+
+#each worker compiles the layout once and keeps it for all batches
+layout = None
+options = None
+
+
+def initWorker(spec, args):
+    """Compiles the layout inside of a worker process.
+
+    Parameters:
+        spec                (dict)              Specification of the layout
+        args                (Namespace)         Parsed command line arguments
+
+    Returns:
+        None
+    """
+    global layout, options
+    layout = Layout(spec)
+    if args.max_lines is not None:
+        layout.maxLines = args.max_lines
+    options = args
+
+
+def renderBatch(batch):
+    """Renders a batch of NDJSON lines. Invalid records are skipped and reported.
+
+    Parameters:
+        batch               (tuple)             Line number of the first line and the list of lines
+
+    Returns:
+        output              (string)            Rendered output of all records inside the batch
+        errors              (list)              Error messages for the records that could not be rendered
+    """
+    lineNumber, lines = batch
+    output = []
+    errors = []
+    for number, line in enumerate(lines, lineNumber):
+        if not line.strip():
+            continue
+        try:
+            output.append(layout.render(json.loads(line), options.width, options.minimal_sgr))
+        except (ValueError, IndexError, KeyError, TypeError, AttributeError) as e:
+            errors.append("ttf: line {}: {}".format(number, e))
+    return ("".join(output), errors)
+
+
+def readBatches(stream, batchSize):
+    """Splits the input stream into batches of lines.
+
+    Parameters:
+        stream              (file)              Input stream
+        batchSize           (int)               Number of lines per batch
+
+    Returns:
+        Generator           (tuple)             Line number of the first line and the list of lines
+    """
+    lineNumber = 1
+    while True:
+        lines = list(itertools.islice(stream, batchSize))
+        if not lines:
+            return
+        yield (lineNumber, lines)
+        lineNumber += len(lines)
+
+
+def main():
+    args = parser.parse_args()
+    try:
+        with open(args.layout) as specFile:
+            spec = json.load(specFile)
+        #compile the layout once in the main process to report errors before any input is read
+        Layout(spec)
+    except (OSError, ValueError) as e:
+        print("ttf: cannot load layout '{}': {}".format(args.layout, e), file=sys.stderr)
+        return 1
+
+    batches = readBatches(sys.stdin, max(args.batch_size, 1))
+    pool = None
+    if args.workers > 1:
+        pool = multiprocessing.Pool(args.workers, initWorker, (spec, args))
+        results = pool.imap(renderBatch, batches)
+    else:
+        initWorker(spec, args)
+        results = map(renderBatch, batches)
+
+    #stdout is block buffered when writing to a pipe. Each batch is written at once
+    failed = 0
+    try:
+        for rendered, errors in results:
+            sys.stdout.write(rendered)
+            for error in errors:
+                print(error, file=sys.stderr)
+            failed += len(errors)
+        sys.stdout.flush()
+    except BrokenPipeError:
+        #the reader went away. Redirect stdout to devnull to avoid another error during shutdown
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if pool:
+            pool.terminate()
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())